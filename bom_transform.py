@@ -55,31 +55,55 @@ BOM 格式转换与校验工具
 """
 from __future__ import annotations
 import argparse
+import copy
 import os
 import sys
 import io
 import re
+import math
 import datetime as dt
+import importlib
 from typing import Dict, List, Tuple, Optional
 
+import numpy as np
 import pandas as pd
 
-try:
-    import chardet  # type: ignore
-except Exception:  # pragma: no cover
-    chardet = None
+# 可选依赖（cchardet/chardet、openpyxl、xlsxwriter、yaml）均在首次使用时才导入，
+# 避免拖慢 CLI 启动以及 GUI 对本模块的导入
+_optional_modules: Dict[str, object] = {}
 
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Border, Side, Alignment, Font
-    from openpyxl.utils import get_column_letter
-except Exception:
-    Workbook = None
 
-try:
-    import yaml  # type: ignore
-except Exception:
-    yaml = None
+def optional_import(name: str):
+    """按需导入可选依赖，导入失败返回 None；结果按模块名缓存"""
+    if name not in _optional_modules:
+        try:
+            _optional_modules[name] = importlib.import_module(name)
+        except Exception:
+            _optional_modules[name] = None
+    return _optional_modules[name]
+
+
+_openpyxl_styles: Dict[str, object] = {}
+
+
+def openpyxl_styles() -> Dict[str, object]:
+    """XLSX 导出共享的 openpyxl 样式对象（首次调用时创建；样式不可变，可在所有单元格间复用）"""
+    if not _openpyxl_styles:
+        from openpyxl.styles import Border, Side, Alignment, Font
+
+        thin_side = Side(style="thin", color="000000")
+        _openpyxl_styles.update(
+            border=Border(
+                left=thin_side, right=thin_side, top=thin_side, bottom=thin_side
+            ),
+            font=Font(name="等线", bold=False),
+            header=Alignment(horizontal="center", vertical="center"),
+            center=Alignment(horizontal="center", vertical="center"),
+            wrap=Alignment(vertical="center", wrap_text=True),
+            vcenter=Alignment(vertical="center"),
+        )
+    return _openpyxl_styles
+
 
 DEFAULT_MAPPING = {
     "required_columns": [
@@ -143,15 +167,31 @@ ISSUE_VALUE_NOT_IN_DESC = "ValueNotInDescription"
 ISSUE_MISSING_CATEGORY = "MissingCategory"
 ISSUE_INVALID_QTY = "InvalidQty"
 
+# 质量报告列
+REPORT_COLUMNS = ["Reference", "描述", "Value", "IssueType", "Detail"]
+
+# 匹配所有空白（空格/制表/换行），用于 描述/Value 归一化比对
+_WS_RE = re.compile(r"\s+")
+
+# 匹配非 ASCII 字符，用于估算 XLSX 列宽
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+
 
 def detect_encoding(path: str) -> str:
-    if chardet is None:
-        return "utf-8"
     try:
         with open(path, "rb") as f:
             raw = f.read(4096)
+        if not raw:
+            return "utf-8"
         if raw.startswith(b"\xef\xbb\xbf"):
             return "utf-8-sig"
+        # 纯 ASCII 内容无需调用检测器
+        if raw.isascii():
+            return "utf-8"
+        # 优先使用 C 实现的 cchardet（faust-cchardet），不可用时回退到 chardet
+        chardet = optional_import("cchardet") or optional_import("chardet")
+        if chardet is None:
+            return "utf-8"
         det = chardet.detect(raw)
         enc = det.get("encoding") or "utf-8"
         # Windows 常见回退
@@ -163,8 +203,12 @@ def detect_encoding(path: str) -> str:
 
 
 def load_config(mapping_path: Optional[str]) -> Dict:
-    config = DEFAULT_MAPPING.copy()
-    if mapping_path and os.path.isfile(mapping_path) and yaml is not None:
+    # 深拷贝默认配置，避免合并用户配置时改写 DEFAULT_MAPPING 中的嵌套字典
+    config = copy.deepcopy(DEFAULT_MAPPING)
+    yaml = None
+    if mapping_path and os.path.isfile(mapping_path):
+        yaml = optional_import("yaml")
+    if yaml is not None:
         try:
             with open(mapping_path, "r", encoding="utf-8") as f:
                 user_cfg = yaml.safe_load(f) or {}
@@ -179,9 +223,31 @@ def load_config(mapping_path: Optional[str]) -> Dict:
     return config
 
 
+def read_bom_csv(path: str, encoding: str) -> pd.DataFrame:
+    """读取 BOM CSV
+
+    安装了 pyarrow 时优先使用其多线程解析引擎，否则回退到 pandas 的 C 引擎。
+    """
+    try:
+        df = pd.read_csv(path, encoding=encoding, engine="pyarrow")
+        # pyarrow 引擎以 None 表示空值，统一为 NaN 以与 C 引擎结果一致
+        return df.fillna(np.nan)
+    except UnicodeDecodeError:
+        raise
+    except Exception:
+        # 未安装 pyarrow 或遇到其不支持的格式
+        pass
+    return pd.read_csv(path, encoding=encoding)
+
+
 def normalize_for_match(s: str) -> str:
     # 忽略大小写和所有空白（空格/制表/换行）
-    return re.sub(r"\s+", "", s or "").upper()
+    return _WS_RE.sub("", s or "").upper()
+
+
+def normalize_series_for_match(s: pd.Series) -> pd.Series:
+    # normalize_for_match 的向量化版本，整列一次性处理
+    return s.fillna("").astype(str).str.replace(_WS_RE, "", regex=True).str.upper()
 
 
 def compute_category_cn(
@@ -193,41 +259,144 @@ def compute_category_cn(
     return cat_map.get(top, cat_map.get(top.capitalize(), unknown))
 
 
+def issues_from_rows(
+    df: pd.DataFrame, mask: pd.Series, issue_type: str, detail: str
+) -> pd.DataFrame:
+    """按布尔掩码整体选取问题行，构造报告 DataFrame（不逐行取值）
+
+    直接在底层 ndarray 上按位置做掩码索引，避免逐标签查找。
+    """
+    positions = np.flatnonzero(mask.to_numpy())
+    if positions.size == 0:
+        # 无问题行时直接返回空表，跳过列提取
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+
+    issues = {}
+    for c in ("Reference", "描述", "Value"):
+        issues[c] = df[c].to_numpy()[positions] if c in df.columns else ""
+    issues["IssueType"] = issue_type
+    issues["Detail"] = detail
+    return pd.DataFrame(issues, index=range(positions.size))
+
+
+def compute_column_widths(df: pd.DataFrame) -> List[float]:
+    """计算每列的显示宽度：位号/数量列固定宽度，其他列按内容自动调整"""
+    widths = []
+    for col_idx, column in enumerate(df.columns):
+        # 特殊处理位号列和数量列
+        if column == "位号":
+            # 位号列固定宽度为31.1
+            widths.append(31.1)
+        elif column == "数量":
+            # 数量列固定宽度为13.13
+            widths.append(13.13)
+        else:
+            # 检查列名长度
+            max_length = len(str(column))
+            # 其他列：整列计算内容显示宽度（中文等非 ASCII 字符按2个字符宽度计算）
+            if len(df) > 0:
+                values = df.iloc[:, col_idx].astype(str)
+                lengths = values.str.len() + values.str.count(_NON_ASCII_RE)
+                max_length = max(max_length, int(lengths.max()))
+
+            # 设置列宽（加一些余量）
+            widths.append(min(max_length + 2, 100))  # 最大宽度限制为100
+    return widths
+
+
+def category_runs(values: np.ndarray) -> List[Tuple[int, int]]:
+    """对分类列做游程编码，返回每个连续相同分类区间的 (start, end) 位置（end 不含）"""
+    if len(values) == 0:
+        return []
+    change_idx = np.flatnonzero(values[1:] != values[:-1]) + 1
+    boundaries = np.concatenate(([0], change_idx, [len(values)])).tolist()
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def cell_value(value):
+    """XLSX 不支持 INF，正负无穷按文本写入（两种导出方式结果一致）"""
+    if isinstance(value, float) and math.isinf(value):
+        return str(value)
+    return value
+
+
 def export_to_xlsx(df: pd.DataFrame, filepath: str) -> None:
-    """导出为格式化的XLSX文件，包含自动列宽、边框和合并单元格"""
-    if Workbook is None:
-        raise ImportError("需要安装 openpyxl 库以支持 XLSX 导出")
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "BOM"
-
-    # 写入表头
-    for c_idx, col_name in enumerate(df.columns, 1):
-        ws.cell(row=1, column=c_idx, value=col_name)
-
-    # 写入数据到工作表
-    for r_idx, row in enumerate(df.itertuples(index=False), 2):
-        for c_idx, value in enumerate(row, 1):
-            ws.cell(row=r_idx, column=c_idx, value=value)
-
-    # 定义边框样式（细边框）
-    thin_border = Border(
-        left=Side(style="thin", color="000000"),
-        right=Side(style="thin", color="000000"),
-        top=Side(style="thin", color="000000"),
-        bottom=Side(style="thin", color="000000"),
-    )
+    """导出为格式化的XLSX文件，包含自动列宽、边框和合并单元格
+
+    优先使用 xlsxwriter（写入速度更快），未安装时回退到 openpyxl。
+    """
+    if optional_import("xlsxwriter") is not None:
+        export_to_xlsx_xlsxwriter(df, filepath)
+    elif optional_import("openpyxl") is not None:
+        export_to_xlsx_openpyxl(df, filepath)
+    else:
+        raise ImportError("需要安装 xlsxwriter 或 openpyxl 库以支持 XLSX 导出")
+
+
+def export_to_xlsx_xlsxwriter(df: pd.DataFrame, filepath: str) -> None:
+    """使用 xlsxwriter 导出 XLSX，格式对象只创建一次并在所有单元格间复用"""
+    import xlsxwriter
+
+    # 与 openpyxl 一致：URL 文本按普通字符串写入，不转换为超链接
+    wb = xlsxwriter.Workbook(filepath, {"strings_to_urls": False})
+    ws = wb.add_worksheet("BOM")
+
+    base = {"font_name": "等线", "border": 1, "border_color": "#000000"}
+    fmt_center = wb.add_format({**base, "align": "center", "valign": "vcenter"})
+    fmt_wrap = wb.add_format({**base, "valign": "vcenter", "text_wrap": True})
+    fmt_default = wb.add_format({**base, "valign": "vcenter"})
+
+    # 每列数据单元格的格式
+    # 第一列（分类列）居中；位号列换行；数量列居中；其他列垂直居中
+    col_formats = []
+    for idx, col_name in enumerate(df.columns):
+        if idx == 0 or col_name == "数量":
+            col_formats.append(fmt_center)
+        elif col_name == "位号":
+            col_formats.append(fmt_wrap)
+        else:
+            col_formats.append(fmt_default)
 
-    # 定义字体（等线，不加粗）
-    dengxian_font = Font(name="等线", bold=False)
+    for col_idx, width in enumerate(compute_column_widths(df)):
+        ws.set_column(col_idx, col_idx, width)
 
     # 表头样式：等线字体，居中，细边框
-    for col in range(1, len(df.columns) + 1):
-        cell = ws.cell(row=1, column=col)
-        cell.font = dengxian_font
-        cell.border = thin_border
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+    ws.write_row(0, 0, [str(c) for c in df.columns], fmt_center)
+
+    def write_cell(r, c, value):
+        if value is None or (isinstance(value, float) and value != value):
+            ws.write_blank(r, c, None, col_formats[c])
+        else:
+            ws.write(r, c, cell_value(value), col_formats[c])
+
+    # 单次遍历写入数据行（表头占第 0 行）
+    for r_idx, row in enumerate(df.itertuples(index=False), 1):
+        for c_idx, value in enumerate(row):
+            write_cell(r_idx, c_idx, value)
+
+    # 合并第一列（分类列）相同的连续单元格
+    if len(df.columns) > 0:
+        categories = df.iloc[:, 0].to_numpy()
+        for start, end in category_runs(categories):
+            if end - start > 1:
+                ws.merge_range(start + 1, 0, end, 0, categories[start], fmt_center)
+
+    wb.close()
+
+
+def export_to_xlsx_openpyxl(df: pd.DataFrame, filepath: str) -> None:
+    """使用 openpyxl 导出 XLSX
+
+    使用 write_only 模式逐行流式写入，样式在写入时直接附加到
+    WriteOnlyCell 上，不在内存中保留完整的单元格网格。
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+
+    styles = openpyxl_styles()
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("BOM")
 
     # 找到位号列和数量列的索引（基于列名）
     weihao_col_idx = None
@@ -238,90 +407,50 @@ def export_to_xlsx(df: pd.DataFrame, filepath: str) -> None:
         elif col_name == "数量":
             shuliang_col_idx = idx
 
-    # 应用边框和字体到所有数据单元格
-    for row in range(2, len(df) + 2):
-        for col in range(1, len(df.columns) + 1):
-            cell = ws.cell(row=row, column=col)
-            cell.border = thin_border
-            cell.font = dengxian_font
-
-            # 位号列：启用换行，垂直居中
-            if col == weihao_col_idx:
-                cell.alignment = Alignment(vertical="center", wrap_text=True)
-            # 数量列：居中显示
-            elif col == shuliang_col_idx:
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-            # 其他列：垂直居中
-            else:
-                cell.alignment = Alignment(vertical="center")
+    # 每列数据单元格的对齐方式
+    # 第一列（分类列）居中；位号列换行；数量列居中；其他列垂直居中
+    col_alignments = []
+    for idx in range(1, len(df.columns) + 1):
+        if idx == 1:
+            col_alignments.append(styles["center"])
+        elif idx == weihao_col_idx:
+            col_alignments.append(styles["wrap"])
+        elif idx == shuliang_col_idx:
+            col_alignments.append(styles["center"])
+        else:
+            col_alignments.append(styles["vcenter"])
 
-    # 合并第一列（分类列）相同的单元格
-    # 第一列是Category_CN_Display，现在每行都包含完整的分类名称
-    if len(df.columns) > 0:
-        # 收集所有相同分类的连续区间
-        ranges = []  # [(start_row, end_row, value), ...]
-        start_row = 2
-        prev_value = df.iloc[0, 0] if len(df) > 0 else None
-
-        for idx in range(len(df)):
-            current_value = df.iloc[idx, 0]
-            row_num = idx + 2
-
-            if current_value != prev_value:
-                # 保存上一个区间
-                ranges.append((start_row, row_num - 1, prev_value))
-                start_row = row_num
-                prev_value = current_value
-
-        # 保存最后一个区间
-        if len(df) > 0:
-            ranges.append((start_row, len(df) + 1, prev_value))
-
-        # 对每个区间进行合并和居中
-        for start, end, value in ranges:
-            if start <= end:
-                if start == end:
-                    # 单行：只设置对齐和字体
-                    cell = ws.cell(row=start, column=1)
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-                    cell.font = dengxian_font
-                else:
-                    # 多行：合并单元格
-                    ws.merge_cells(
-                        start_row=start, start_column=1, end_row=end, end_column=1
-                    )
-                    merged_cell = ws.cell(row=start, column=1)
-                    merged_cell.alignment = Alignment(
-                        horizontal="center", vertical="center"
-                    )
-                    merged_cell.font = dengxian_font
-
-    # 自动调整列宽
-    for col_idx, column in enumerate(df.columns, 1):
-        max_length = 0
-        column_letter = get_column_letter(col_idx)
-
-        # 检查列名长度
-        max_length = len(str(column))
+    # 列宽（write_only 模式下必须在写入任何行之前设置）
+    for col_idx, width in enumerate(compute_column_widths(df), 1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
 
-        # 特殊处理位号列和数量列
-        if column == "位号":
-            # 位号列固定宽度为31.1
-            ws.column_dimensions[column_letter].width = 31.1
-        elif column == "数量":
-            # 数量列固定宽度为13.13
-            ws.column_dimensions[column_letter].width = 13.13
-        else:
-            # 其他列：检查每个单元格的内容长度
-            for row_idx in range(len(df)):
-                cell_value = str(df.iloc[row_idx, col_idx - 1])
-                # 中文字符按2个字符宽度计算
-                cell_length = sum(2 if ord(c) > 127 else 1 for c in cell_value)
-                max_length = max(max_length, cell_length)
+    def make_cell(value, alignment):
+        cell = WriteOnlyCell(ws, value=cell_value(value))
+        cell.font = styles["font"]
+        cell.border = styles["border"]
+        cell.alignment = alignment
+        return cell
 
-            # 设置列宽（加一些余量）
-            adjusted_width = min(max_length + 2, 100)  # 最大宽度限制为100
-            ws.column_dimensions[column_letter].width = adjusted_width
+    # 表头样式：等线字体，居中，细边框
+    ws.append([make_cell(col_name, styles["header"]) for col_name in df.columns])
+
+    # 对第一列（分类列）做游程编码，得到需要合并的连续区间
+    runs = category_runs(df.iloc[:, 0].to_numpy()) if len(df.columns) > 0 else []
+    run_starts = {start for start, _ in runs}
+
+    # 单次遍历写入数据行：创建带样式的单元格
+    for pos, row in enumerate(df.itertuples(index=False)):
+        # 合并区域内仅左上角单元格保留值
+        cat = row[0] if pos in run_starts else None
+        row_cells = [make_cell(cat, col_alignments[0])]
+        for c_idx in range(1, len(row)):
+            row_cells.append(make_cell(row[c_idx], col_alignments[c_idx]))
+        ws.append(row_cells)
+
+    # 合并第一列（分类列）相同的单元格（数据从第 2 行开始）
+    for start, end in runs:
+        if end - start > 1:
+            ws.merged_cells.add(f"A{start + 2}:A{end + 1}")
 
     wb.save(filepath)
 
@@ -334,78 +463,91 @@ def transform(df: pd.DataFrame, cfg: Dict) -> Tuple[pd.DataFrame, pd.DataFrame]:
     issue_type_cn = cfg.get("issue_type_cn", {})
     options = cfg.get("options", {})
 
-    issues = []  # list of dicts
+    # 使用默认 RangeIndex，使位置索引与标签索引一致（后续按标签回写掩码时不会错位）
+    df = df.reset_index(drop=True)
+
+    issue_frames = []  # 每类问题一个 DataFrame，最后统一 concat
 
     # 记录缺失列
     missing_cols = [c for c in required if c not in df.columns]
-    for c in missing_cols:
-        issues.append(
-            {
-                "Reference": "",
-                "描述": "",
-                "Value": "",
-                "IssueType": ISSUE_MISSING_COLUMN,
-                "Detail": f"缺失必需列: {c}",
-            }
+    if missing_cols:
+        issue_frames.append(
+            pd.DataFrame(
+                {
+                    "Reference": "",
+                    "描述": "",
+                    "Value": "",
+                    "IssueType": ISSUE_MISSING_COLUMN,
+                    "Detail": [f"缺失必需列: {c}" for c in missing_cols],
+                }
+            )
         )
 
     # 对存在的列进行基本清洗（去首尾空白）
-    for c in df.columns:
-        if pd.api.types.is_string_dtype(df[c]):
-            df[c] = df[c].astype(str).map(lambda x: x.strip())
-
-    # 处理 Qty 尝试转 int
+    # 仅处理含字符串的 object 列（全为布尔值等的列不能用 .str），
+    # 保留 NaN 与非字符串值（.str.strip 对其返回 NaN，回填原值）
+    for c in df.select_dtypes(include="object").columns:
+        if pd.api.types.infer_dtype(df[c], skipna=True) not in ("string", "mixed"):
+            continue
+        stripped = df[c].str.strip()
+        df[c] = stripped.where(stripped.notna(), df[c])
+
+    # 处理 Qty 尝试转 int（向量化解析，无法解析的值保持原样并记录 issue）
     if "Qty" in df.columns:
-
-        def to_int_or_keep(x):
-            if pd.isna(x):
-                return x
+        qty = df["Qty"]
+        present = qty.notna()
+        # NFKC 把全角数字等转换为 ASCII，与 float() 的接受范围保持一致
+        text = qty.astype(str).str.normalize("NFKC").str.strip()
+        # 按 float 转换，与原逻辑 int(float(x)) 的取整和精度一致
+        num = pd.to_numeric(text, errors="coerce").astype("float64")
+        # int64 可表示范围内的值直接向量化转换（NaN/INF 比较结果为 False）
+        fast = present & (num >= -(2.0**63)) & (num < 2.0**63)
+        converted = qty.astype(object)
+        converted[fast] = num[fast].astype("int64").tolist()
+
+        # 其余少量值（超出 int64 的大数、to_numeric 不接受的写法）按原逻辑逐个解析
+        bad_mask = pd.Series(False, index=qty.index)
+        for pos in np.flatnonzero((present & ~fast).to_numpy()):
             try:
-                xi = int(float(str(x).strip()))
-                return xi
-            except Exception:
-                issues.append(
+                converted.iat[pos] = int(float(str(qty.iat[pos]).strip()))
+            except (ValueError, OverflowError):
+                bad_mask.iat[pos] = True
+        if bad_mask.any():
+            bad_text = qty[bad_mask].astype(str)
+            issue_frames.append(
+                pd.DataFrame(
                     {
                         "Reference": "",
-                        "描述": str(x),
+                        "描述": bad_text,
                         "Value": "",
                         "IssueType": ISSUE_INVALID_QTY,
-                        "Detail": f"数量格式无效: {x}",
+                        "Detail": "数量格式无效: " + bad_text,
                     }
                 )
-                return x
+            )
 
-        df["Qty"] = df["Qty"].map(to_int_or_keep)
+        df["Qty"] = converted.infer_objects()
 
     # 生成中文分类列
     if "Category" in df.columns:
-        df["Category_CN"] = df["Category"].map(
-            lambda s: compute_category_cn(s, cat_map, unknown)
-        )
-
-        # 提取英文顶级分类
+        # 分类值在 BOM 中大量重复，仅对去重后的值计算一次映射
         def extract_top_category(cat):
             if not isinstance(cat, str) or cat.strip() == "":
                 return ""
             return cat.split("/", 1)[0].strip()
 
-        df["Category_Top"] = df["Category"].map(extract_top_category)
+        uniques = df["Category"].dropna().unique()
+        cn_lookup = {u: compute_category_cn(u, cat_map, unknown) for u in uniques}
+        top_lookup = {u: extract_top_category(u) for u in uniques}  # 英文顶级分类
+        df["Category_CN"] = df["Category"].map(cn_lookup).fillna(unknown)
+        df["Category_Top"] = df["Category"].map(top_lookup).fillna("")
         # 对空类别记录 issue
         mask_empty_cat = df["Category"].isna() | (
             df["Category"].astype(str).str.strip() == ""
         )
-        for idx in df[mask_empty_cat].index:
-            issues.append(
-                {
-                    "Reference": (
-                        df.at[idx, "Reference"] if "Reference" in df.columns else ""
-                    ),
-                    "描述": df.at[idx, "描述"] if "描述" in df.columns else "",
-                    "Value": df.at[idx, "Value"] if "Value" in df.columns else "",
-                    "IssueType": ISSUE_MISSING_CATEGORY,
-                    "Detail": "分类字段为空",
-                }
-            )
+        issue_frames.append(
+            issues_from_rows(df, mask_empty_cat, ISSUE_MISSING_CATEGORY, "分类字段为空")
+        )
     else:
         df["Category_CN"] = unknown
         df["Category_Top"] = ""
@@ -416,47 +558,29 @@ def transform(df: pd.DataFrame, cfg: Dict) -> Tuple[pd.DataFrame, pd.DataFrame]:
         and "描述" in df.columns
         and "Value" in df.columns
     ):
-        desc_norm = df["描述"].fillna("").map(normalize_for_match)
-        val_norm = df["Value"].fillna("").map(normalize_for_match)
+        desc_norm = normalize_series_for_match(df["描述"])
+        val_norm = normalize_series_for_match(df["Value"])
 
         # 空描述
-        for idx in df[
-            df["描述"].isna() | (df["描述"].astype(str).str.strip() == "")
-        ].index:
-            issues.append(
-                {
-                    "Reference": (
-                        df.at[idx, "Reference"] if "Reference" in df.columns else ""
-                    ),
-                    "描述": df.at[idx, "描述"] if "描述" in df.columns else "",
-                    "Value": df.at[idx, "Value"] if "Value" in df.columns else "",
-                    "IssueType": ISSUE_EMPTY_DESC,
-                    "Detail": "描述字段为空",
-                }
-            )
+        mask_empty_desc = df["描述"].isna() | (df["描述"].astype(str).str.strip() == "")
+        issue_frames.append(
+            issues_from_rows(df, mask_empty_desc, ISSUE_EMPTY_DESC, "描述字段为空")
+        )
 
-        # Value 未包含于 描述（逐行比较，忽略大小写与空白）
-        # pandas 对 Series vs Series 的 str.contains 支持有限，这里用逐行判断以避免类型问题
-        contains_list = []
-        for a, b in zip(desc_norm.tolist(), val_norm.tolist()):
-            if not b:  # 空 Value 视为不检测
-                contains_list.append(True)
-            else:
-                contains_list.append(b in a)
-        contains_mask = pd.Series(contains_list, index=df.index)
-        mismatch = (val_norm != "") & (~contains_mask)
-        for idx in df[mismatch].index:
-            issues.append(
-                {
-                    "Reference": (
-                        df.at[idx, "Reference"] if "Reference" in df.columns else ""
-                    ),
-                    "描述": df.at[idx, "描述"] if "描述" in df.columns else "",
-                    "Value": df.at[idx, "Value"] if "Value" in df.columns else "",
-                    "IssueType": ISSUE_VALUE_NOT_IN_DESC,
-                    "Detail": "Value值未包含在描述中（忽略大小写和空格的比对）",
-                }
+        # Value 未包含于 描述（忽略大小写与空白）
+        # 同一 Value 往往出现在多行中，按归一化后的 Value 分组，每组只做一次向量化子串查找
+        mismatch = pd.Series(False, index=df.index)
+        has_value = val_norm != ""  # 空 Value 视为不检测
+        for val, desc_group in desc_norm[has_value].groupby(val_norm[has_value]):
+            mismatch[desc_group.index] = ~desc_group.str.contains(val, regex=False)
+        issue_frames.append(
+            issues_from_rows(
+                df,
+                mismatch,
+                ISSUE_VALUE_NOT_IN_DESC,
+                "Value值未包含在描述中（忽略大小写和空格的比对）",
             )
+        )
 
     # 排序
     sort_keys = options.get("sort_by", ["Category_CN", "Reference"])
@@ -481,14 +605,17 @@ def transform(df: pd.DataFrame, cfg: Dict) -> Tuple[pd.DataFrame, pd.DataFrame]:
         out_df[out_col] = df[src_col] if src_col in df.columns else ""
 
     # 报告 DataFrame
-    report_df = pd.DataFrame(
-        issues, columns=["Reference", "描述", "Value", "IssueType", "Detail"]
-    )
+    issue_frames = [f for f in issue_frames if not f.empty]
+    if issue_frames:
+        report_df = pd.concat(issue_frames, ignore_index=True)[REPORT_COLUMNS]
+    else:
+        report_df = pd.DataFrame(columns=REPORT_COLUMNS)
 
     return out_df, report_df
 
 
-def main(argv: Optional[List[str]] = None) -> int:
+def main(argv: Optional[List[str]] = None, cfg: Optional[Dict] = None) -> int:
+    """命令行入口；cfg 可传入已加载的配置以跳过 mapping 解析"""
     parser = argparse.ArgumentParser(description="BOM CSV 转换与校验")
     parser.add_argument("--input", "-i", required=True, help="输入 CSV 文件路径")
     parser.add_argument("--output-dir", "-o", default=".", help="输出目录")
@@ -509,22 +636,44 @@ def main(argv: Optional[List[str]] = None) -> int:
     )
     args = parser.parse_args(argv)
 
-    cfg = load_config(args.mapping)
+    if cfg is None:
+        cfg = load_config(args.mapping)
+
+    return transform_file(
+        args.input,
+        cfg,
+        args.output_dir,
+        project_name=args.project_name,
+        encoding=args.encoding,
+        quiet=args.quiet,
+    )
+
 
-    in_path = args.input
+def transform_file(
+    in_path: str,
+    cfg: Dict,
+    output_dir: str = ".",
+    project_name: Optional[str] = None,
+    encoding: Optional[str] = None,
+    quiet: bool = False,
+) -> int:
+    """转换单个 BOM CSV 并写出结果与报告，返回退出码
+
+    供 GUI 直接调用（配置已预先加载），无需经过 argparse。
+    """
     if not os.path.isfile(in_path):
         print(f"[ERROR] 输入文件不存在: {in_path}")
         return 2
 
-    enc = args.encoding or detect_encoding(in_path)
+    enc = encoding or detect_encoding(in_path)
 
     try:
-        df = pd.read_csv(in_path, encoding=enc)
+        df = read_bom_csv(in_path, enc)
     except UnicodeDecodeError:
         # 退回尝试 utf-8-sig / gbk
         for alt in ("utf-8-sig", "gbk", "utf-8"):
             try:
-                df = pd.read_csv(in_path, encoding=alt)
+                df = read_bom_csv(in_path, alt)
                 enc = alt
                 break
             except Exception:
@@ -536,60 +685,60 @@ def main(argv: Optional[List[str]] = None) -> int:
     out_df, report_df = transform(df, cfg)
 
     # 输出目录与文件名
-    os.makedirs(args.output_dir, exist_ok=True)
-    base_project = args.project_name or os.path.splitext(os.path.basename(in_path))[0]
+    os.makedirs(output_dir, exist_ok=True)
+    base_project = project_name or os.path.splitext(os.path.basename(in_path))[0]
     date_tag = dt.datetime.now().strftime("%Y%m%d")
 
     export_format = cfg.get("options", {}).get("export_format", "csv").lower()
 
     if export_format == "xlsx":
-        out_file = os.path.join(args.output_dir, f"{base_project}_BOM_{date_tag}.xlsx")
+        out_file = os.path.join(output_dir, f"{base_project}_BOM_{date_tag}.xlsx")
         export_to_xlsx(out_df, out_file)
     else:
-        out_file = os.path.join(args.output_dir, f"{base_project}_BOM_{date_tag}.csv")
+        out_file = os.path.join(output_dir, f"{base_project}_BOM_{date_tag}.csv")
         out_df.to_csv(out_file, index=False, encoding="utf-8-sig")
 
-    rep_file = os.path.join(
-        args.output_dir, f"{base_project}_BOM_Report_{date_tag}.txt"
-    )
+    rep_file = os.path.join(output_dir, f"{base_project}_BOM_Report_{date_tag}.txt")
 
     if cfg.get("options", {}).get("generate_report", True):
-        # 写入TXT格式报告
+        # 写入TXT格式报告：先拼接到列表，最后一次性写入
+        parts = [
+            "BOM 转换质量报告\n",
+            "=" * 80 + "\n\n",
+            f"项目名称: {base_project}\n",
+            f"生成时间: {dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            f"输入文件: {in_path}\n",
+            f"输入编码: {enc}\n",
+            f"总行数: {len(df)}\n\n",
+        ]
+
+        if not report_df.empty:
+            summary = report_df.groupby("IssueType").size().sort_values(ascending=False)
+            parts.append("问题统计\n")
+            parts.append("-" * 80 + "\n")
+            for t, n in summary.items():
+                parts.append(f"  {t}: {n}\n")
+            parts.append("\n")
+
+            parts.append("错误详情\n")
+            parts.append("=" * 80 + "\n\n")
+            issue_type_cn_map = cfg.get("issue_type_cn", {})
+            # 描述 不是合法的属性名，itertuples 前先改名
+            rep = report_df.rename(columns={"描述": "desc"})
+            for row in rep.itertuples(index=False):
+                issue_type_cn = issue_type_cn_map.get(row.IssueType, row.IssueType)
+                parts.append(f"[{issue_type_cn}] 位号: {row.Reference}\n")
+                parts.append(f"  详情: {row.Detail}\n")
+                if row.desc:
+                    parts.append(f"  描述: {row.desc}\n")
+                if row.Value:
+                    parts.append(f"  Value: {row.Value}\n")
+                parts.append("\n")
+        else:
+            parts.append("未发现质量问题。\n")
+
         with open(rep_file, "w", encoding="utf-8") as f:
-            f.write("BOM 转换质量报告\n")
-            f.write("=" * 80 + "\n\n")
-            f.write(f"项目名称: {base_project}\n")
-            f.write(f"生成时间: {dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"输入文件: {in_path}\n")
-            f.write(f"输入编码: {enc}\n")
-            f.write(f"总行数: {len(df)}\n\n")
-
-            if not report_df.empty:
-                summary = (
-                    report_df.groupby("IssueType").size().sort_values(ascending=False)
-                )
-                f.write("问题统计\n")
-                f.write("-" * 80 + "\n")
-                for t, n in summary.items():
-                    f.write(f"  {t}: {n}\n")
-                f.write("\n")
-
-                f.write("错误详情\n")
-                f.write("=" * 80 + "\n\n")
-                issue_type_cn_map = cfg.get("issue_type_cn", {})
-                for idx, row in report_df.iterrows():
-                    issue_type_cn = issue_type_cn_map.get(
-                        row["IssueType"], row["IssueType"]
-                    )
-                    f.write(f"[{issue_type_cn}] 位号: {row['Reference']}\n")
-                    f.write(f"  详情: {row['Detail']}\n")
-                    if row["描述"]:
-                        f.write(f"  描述: {row['描述']}\n")
-                    if row["Value"]:
-                        f.write(f"  Value: {row['Value']}\n")
-                    f.write("\n")
-            else:
-                f.write("未发现质量问题。\n")
+            f.write("".join(parts))
 
     # 控制台汇总
     print(f"输入编码: {enc}")
@@ -603,18 +752,17 @@ def main(argv: Optional[List[str]] = None) -> int:
                 print(f"  - {t}: {n}")
 
             # 仅在非静默模式下输出所有错误详情到终端
-            if not args.quiet:
+            if not quiet:
                 print("\n========== 错误报告详情 ==========")
                 issue_type_cn_map = cfg.get("issue_type_cn", {})
-                for idx, row in report_df.iterrows():
-                    issue_type_cn = issue_type_cn_map.get(
-                        row["IssueType"], row["IssueType"]
-                    )
-                    print(f"[{issue_type_cn}] {row['Reference']}: {row['Detail']}")
-                    if row["描述"]:
-                        print(f"  描述: {row['描述']}")
-                    if row["Value"]:
-                        print(f"  Value: {row['Value']}")
+                rep = report_df.rename(columns={"描述": "desc"})
+                for row in rep.itertuples(index=False):
+                    issue_type_cn = issue_type_cn_map.get(row.IssueType, row.IssueType)
+                    print(f"[{issue_type_cn}] {row.Reference}: {row.Detail}")
+                    if row.desc:
+                        print(f"  描述: {row.desc}")
+                    if row.Value:
+                        print(f"  Value: {row.Value}")
                     print()
             else:
                 print("(详细错误报告已保存到文件，使用 -q 参数已隐藏终端输出)")
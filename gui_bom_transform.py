@@ -20,27 +20,29 @@ import subprocess
 import threading
 import queue
 import shutil
+import importlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
-
-# 导入原始脚本的 main 函数
-try:
-    from bom_transform import main as bom_main
-except ImportError as e:
-    messagebox.showerror(
-        "导入错误",
-        f"无法导入 bom_transform 模块: {e}\n请确保 bom_transform.py 在同一目录下。",
-    )
-    sys.exit(1)
-
-try:
-    from kicad_export import main as kicad_main
-except ImportError as e:
-    messagebox.showerror(
-        "导入错误",
-        f"无法导入 kicad_export 模块: {e}\n请确保 kicad_export.py 在同一目录下。",
-    )
-    sys.exit(1)
+from typing import Dict, Optional, Tuple
+
+# 进程生命周期内不变的平台信息，模块加载时计算一次
+_IS_WINDOWS = sys.platform.startswith("win")
+
+# bom_transform / kicad_export 在首次使用对应功能时才导入
+# （见 _get_bom_module / _get_kicad_main），避免其依赖（pandas 等）拖慢窗口首次显示
+
+
+def _popen_kwargs() -> dict:
+    """子进程附加参数：Windows 下不为控制台程序创建窗口，避免探测时黑框闪烁"""
+    if _IS_WINDOWS:
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        startupinfo.wShowWindow = subprocess.SW_HIDE
+        return {
+            "creationflags": subprocess.CREATE_NO_WINDOW,
+            "startupinfo": startupinfo,
+        }
+    return {}
 
 
 class BOMTransformGUI:
@@ -53,6 +55,22 @@ class BOMTransformGUI:
         # 用于线程间通信的队列
         self.update_queue = queue.Queue()
 
+        # 进程级 stdout/stderr 只替换一次，后台任务各自绑定本线程的写入目标
+        # （使用 kicad_export.ThreadRoutedStream，与其并行任务的输出分流共用）
+        self._stdout = self._stderr = None
+        kicad_module = self._get_kicad_module(quiet=True)
+        if kicad_module is not None:
+            self._stdout = kicad_module.ThreadRoutedStream.install("stdout")
+            self._stderr = kicad_module.ThreadRoutedStream.install("stderr")
+
+        # 延迟导入的脚本模块，以及只加载一次、多次转换时复用的默认 BOM 配置
+        self._bom_module = None
+        self._kicad_module = None
+        self.bom_default_cfg = None
+
+        # KiCad CLI 探测结果：(可执行文件路径, mtime) -> 是否可用
+        self._cli_verified: Dict[Tuple[str, float], bool] = {}
+
         # 创建选项卡
         self.notebook = ttk.Notebook(root)
         self.notebook.pack(fill="both", expand=True, padx=10, pady=10)
@@ -74,105 +92,190 @@ class BOMTransformGUI:
         self._check_update_queue()
 
     def _check_update_queue(self):
-        """检查更新队列并处理UI更新"""
+        """检查更新队列并处理UI更新
+
+        同一输出框的连续输出会合并为一次 insert，减少 Tk 重绘次数。
+        """
+        # 待写入的输出：[(输出框, [文本片段, ...]), ...]
+        pending = []
+
+        def flush():
+            for output_text, chunks in pending:
+                self._append_output(output_text, "".join(chunks))
+            pending.clear()
+
         try:
             while True:
                 update_type, *args = self.update_queue.get_nowait()
+                if update_type == "command_output":
+                    output_text, text = args
+                    if pending and pending[-1][0] is output_text:
+                        pending[-1][1].append(text)
+                    else:
+                        pending.append((output_text, [text]))
+                    continue
+
+                # 其他更新前先写出已累积的输出，保持顺序
+                flush()
                 if update_type == "kicad_output":
                     self._update_kicad_output(*args)
                 elif update_type == "kicad_error":
                     self._update_kicad_output_error(*args)
+                elif update_type == "command_done":
+                    self._finish_command(*args)
         except queue.Empty:
             pass
+        flush()
 
         # 每100ms检查一次队列
         self.root.after(100, self._check_update_queue)
 
+    def _import_script(self, module_name: str, quiet: bool = False):
+        """导入同目录下的脚本模块，失败时弹窗提示（quiet 时不提示）并返回 None"""
+        try:
+            return importlib.import_module(module_name)
+        except ImportError as e:
+            if quiet:
+                return None
+            messagebox.showerror(
+                "导入错误",
+                f"无法导入 {module_name} 模块: {e}\n请确保 {module_name}.py 在同一目录下。",
+            )
+            return None
+
+    def _get_bom_module(self):
+        """首次使用时导入 bom_transform 并缓存"""
+        if self._bom_module is None:
+            self._bom_module = self._import_script("bom_transform")
+        return self._bom_module
+
+    def _get_kicad_module(self, quiet: bool = False):
+        """首次使用时导入 kicad_export 并缓存"""
+        if self._kicad_module is None:
+            self._kicad_module = self._import_script("kicad_export", quiet)
+        return self._kicad_module
+
+    def _get_kicad_main(self):
+        """kicad_export.main，导入失败时返回 None"""
+        module = self._get_kicad_module()
+        return module.main if module is not None else None
+
+    def _probe_kicad_cli(self, cmd: str) -> bool:
+        """运行 `<cmd> version` 检查命令是否可用
+
+        结果按 (可执行文件路径, mtime) 记忆，文件未变化时不再重复启动进程。
+        """
+        exe_path = cmd if os.path.isabs(cmd) else shutil.which(cmd)
+        if exe_path is None:
+            return False
+        try:
+            key = (exe_path, os.path.getmtime(exe_path))
+        except OSError:
+            return False
+        if key in self._cli_verified:
+            return self._cli_verified[key]
+
+        try:
+            result = subprocess.run(
+                [exe_path, "version"],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                **_popen_kwargs(),
+            )
+            ok = result.returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            ok = False
+        self._cli_verified[key] = ok
+        return ok
+
+    def _probe_first(self, candidates) -> Optional[str]:
+        """并发探测候选命令，按候选顺序返回第一个可用的命令
+
+        所有候选同时启动，总耗时取决于最慢的一个而不是超时之和。
+        """
+        if not candidates:
+            return None
+        executor = ThreadPoolExecutor(max_workers=min(8, len(candidates)))
+        try:
+            futures = [executor.submit(self._probe_kicad_cli, c) for c in candidates]
+            for cmd, future in zip(candidates, futures):
+                if future.result():
+                    return cmd
+            return None
+        finally:
+            # 已找到结果时不等待其余探测结束
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def detect_kicad_cli(self) -> Optional[str]:
         """检测可用的KiCad CLI命令"""
-        # 尝试系统路径中的命令
-        commands = ["kicad-cli", "kicad.kicad-cli"]
-
-        for cmd in commands:
+        # PATH 中的命令与常见安装目录下的各个版本，与 kicad_export 的自动检测一致
+        module = self._get_kicad_module(quiet=True)
+        if module is not None:
+            candidates = module.kicad_cli_candidates()
+        else:
+            candidates = ["kicad-cli", "kicad.kicad-cli"]
+
+        # 先并发探测 PATH 命令与常见安装位置
+        found = self._probe_first(candidates)
+        if found or not _IS_WINDOWS:
+            return found
+
+        # 回退：扫描各驱动器下所有用户的安装目录（任意版本）
+        hits = []
+        for drive in ["C:", "D:"]:
+            hits.extend(self._scan_user_installs(drive + "\\Users"))
+        return self._probe_first(hits)
+
+    @staticmethod
+    def _scan_user_installs(users_dir: str):
+        """用 os.scandir 枚举各用户目录下安装的 kicad-cli.exe
+
+        路径形如 <users_dir>\\<用户>\\AppData\\Local\\Programs\\KiCad\\<版本>\\bin。
+        DirEntry.is_dir() 直接使用目录枚举返回的信息，无需逐项 stat；
+        同一用户下的多个版本按版本号从高到低返回。
+        """
+        try:
+            with os.scandir(users_dir) as users:
+                user_dirs = [u.path for u in users if u.is_dir(follow_symlinks=False)]
+        except OSError:
+            return
+        for user_dir in user_dirs:
+            kicad_dir = os.path.join(user_dir, "AppData", "Local", "Programs", "KiCad")
             try:
-                result = subprocess.run(
-                    [cmd, "version"], capture_output=True, text=True, timeout=5
-                )
-                if result.returncode == 0:
-                    return cmd
-            except (FileNotFoundError, subprocess.TimeoutExpired):
+                with os.scandir(kicad_dir) as versions:
+                    version_dirs = [v for v in versions if v.is_dir()]
+            except OSError:
                 continue
-
-        # 在Windows上尝试常见安装路径
-        import platform
-
-        if platform.system() == "Windows":
-            possible_paths = []
-
-            # 添加系统Program Files路径
-            program_files = os.environ.get("ProgramFiles", "C:\\Program Files")
-            possible_paths.append(
-                Path(program_files) / "KiCad" / "9.0" / "bin" / "kicad-cli.exe"
+            # 按版本号（如 10.0 > 9.0）从高到低排列
+            version_dirs.sort(
+                key=lambda v: [int(n) if n.isdigit() else 0 for n in v.name.split(".")],
+                reverse=True,
+            )
+            for version_dir in version_dirs:
+                candidate = os.path.join(version_dir.path, "bin", "kicad-cli.exe")
+                if os.path.isfile(candidate):
+                    yield candidate
+
+    def _add_row(
+        self, frame, row, label, var, browse_cmd=None, extra_btn=None, entry_span=1
+    ):
+        """添加一行 标签 + 输入框 [+ 浏览按钮] [+ 附加按钮]"""
+        tk.Label(frame, text=label).grid(row=row, column=0, sticky="w", padx=10, pady=5)
+        tk.Entry(frame, textvariable=var).grid(
+            row=row, column=1, columnspan=entry_span, sticky="ew", padx=10, pady=5
+        )
+        column = 1 + entry_span
+        if browse_cmd is not None:
+            tk.Button(frame, text="浏览...", command=browse_cmd).grid(
+                row=row, column=column, padx=10, pady=5
+            )
+            column += 1
+        if extra_btn is not None:
+            text, command = extra_btn
+            tk.Button(frame, text=text, command=command).grid(
+                row=row, column=column, padx=10, pady=5
             )
-
-            # 添加用户AppData路径（支持多个驱动器）
-            local_appdata = os.environ.get("LOCALAPPDATA")
-            if local_appdata:
-                possible_paths.append(
-                    Path(local_appdata)
-                    / "Programs"
-                    / "KiCad"
-                    / "9.0"
-                    / "bin"
-                    / "kicad-cli.exe"
-                )
-
-                # 添加用户指定的常见安装路径
-                possible_paths.append(
-                    Path(
-                        "D:\\Users\\tyk\\AppData\\Local\\Programs\\KiCad\\9.0\\bin\\kicad-cli.exe"
-                    )
-                )
-
-                # 检查其他驱动器（C: 和 D:）
-                for drive in ["C:", "D:"]:
-                    try:
-                        drive_path = Path(drive) / "Users"
-                        if drive_path.exists():
-                            # 查找所有用户目录
-                            for user_dir in drive_path.iterdir():
-                                if user_dir.is_dir():
-                                    appdata_path = (
-                                        user_dir
-                                        / "AppData"
-                                        / "Local"
-                                        / "Programs"
-                                        / "KiCad"
-                                        / "9.0"
-                                        / "bin"
-                                        / "kicad-cli.exe"
-                                    )
-                                    if appdata_path.exists():
-                                        possible_paths.append(appdata_path)
-                    except (OSError, PermissionError):
-                        continue
-
-            # 检查所有可能的路径
-            for cli_path in possible_paths:
-                if cli_path.exists():
-                    try:
-                        result = subprocess.run(
-                            [str(cli_path), "version"],
-                            capture_output=True,
-                            text=True,
-                            timeout=5,
-                        )
-                        if result.returncode == 0:
-                            return str(cli_path)
-                    except (FileNotFoundError, subprocess.TimeoutExpired):
-                        continue
-
-        return None
 
     def create_bom_tab(self):
         # 设置网格权重，让组件可以扩展
@@ -188,46 +291,19 @@ class BOMTransformGUI:
         self.bom_mapping_file = tk.StringVar()
         self.bom_quiet = tk.BooleanVar(value=False)
 
-        # 输入文件
-        tk.Label(self.bom_frame, text="输入 CSV 文件:").grid(
-            row=0, column=0, sticky="w", padx=10, pady=5
-        )
-        tk.Entry(self.bom_frame, textvariable=self.bom_input_file).grid(
-            row=0, column=1, sticky="ew", padx=10, pady=5
-        )
-        tk.Button(
-            self.bom_frame, text="浏览...", command=self.select_bom_input_file
-        ).grid(row=0, column=2, padx=10, pady=5)
-
-        # 输出目录
-        tk.Label(self.bom_frame, text="输出目录:").grid(
-            row=1, column=0, sticky="w", padx=10, pady=5
-        )
-        tk.Entry(self.bom_frame, textvariable=self.bom_output_dir).grid(
-            row=1, column=1, sticky="ew", padx=10, pady=5
-        )
-        tk.Button(
-            self.bom_frame, text="浏览...", command=self.select_bom_output_dir
-        ).grid(row=1, column=2, padx=10, pady=5)
-
-        # 项目名称
-        tk.Label(self.bom_frame, text="项目名称 (可选):").grid(
-            row=2, column=0, sticky="w", padx=10, pady=5
-        )
-        tk.Entry(self.bom_frame, textvariable=self.bom_project_name).grid(
-            row=2, column=1, sticky="ew", padx=10, pady=5
-        )
-
-        # 映射文件
-        tk.Label(self.bom_frame, text="映射配置文件 (可选):").grid(
-            row=3, column=0, sticky="w", padx=10, pady=5
-        )
-        tk.Entry(self.bom_frame, textvariable=self.bom_mapping_file).grid(
-            row=3, column=1, sticky="ew", padx=10, pady=5
-        )
-        tk.Button(
-            self.bom_frame, text="浏览...", command=self.select_bom_mapping_file
-        ).grid(row=3, column=2, padx=10, pady=5)
+        # 文件/目录输入行：(标签, 变量, 浏览命令)
+        rows = [
+            ("输入 CSV 文件:", self.bom_input_file, self.select_bom_input_file),
+            ("输出目录:", self.bom_output_dir, self.select_bom_output_dir),
+            ("项目名称 (可选):", self.bom_project_name, None),
+            (
+                "映射配置文件 (可选):",
+                self.bom_mapping_file,
+                self.select_bom_mapping_file,
+            ),
+        ]
+        for row, (label, var, browse_cmd) in enumerate(rows):
+            self._add_row(self.bom_frame, row, label, var, browse_cmd)
 
         # 选项
         tk.Checkbutton(
@@ -235,20 +311,21 @@ class BOMTransformGUI:
         ).grid(row=4, column=0, columnspan=3, sticky="w", padx=10, pady=5)
 
         # 运行按钮
-        tk.Button(
+        self.bom_run_button = tk.Button(
             self.bom_frame,
             text="运行 BOM 转换",
             command=self.run_bom_transform,
             bg="green",
             fg="white",
-        ).grid(row=5, column=0, columnspan=3, pady=10)
+        )
+        self.bom_run_button.grid(row=5, column=0, columnspan=3, pady=10)
 
         # 输出区域
         tk.Label(self.bom_frame, text="转换输出:").grid(
             row=6, column=0, columnspan=3, sticky="w", padx=10, pady=5
         )
         self.bom_output_text = scrolledtext.ScrolledText(
-            self.bom_frame, height=12, state="disabled"
+            self.bom_frame, height=12, state="disabled", undo=False, maxundo=0
         )
         self.bom_output_text.grid(
             row=7, column=0, columnspan=3, padx=10, pady=5, sticky="nsew"
@@ -271,41 +348,28 @@ class BOMTransformGUI:
         self.kicad_skip_exports = tk.BooleanVar(value=False)
         self.kicad_export_mode = tk.BooleanVar(value=False)
 
-        # 项目文件
-        tk.Label(self.kicad_frame, text="KiCad 项目文件:").grid(
-            row=0, column=0, sticky="w", padx=10, pady=5
-        )
-        tk.Entry(self.kicad_frame, textvariable=self.kicad_project_file).grid(
-            row=0, column=1, columnspan=2, sticky="ew", padx=10, pady=5
-        )
-        tk.Button(
-            self.kicad_frame, text="浏览...", command=self.select_kicad_project_file
-        ).grid(row=0, column=3, padx=10, pady=5)
-
-        # 输出目录
-        tk.Label(self.kicad_frame, text="输出目录:").grid(
-            row=1, column=0, sticky="w", padx=10, pady=5
-        )
-        tk.Entry(self.kicad_frame, textvariable=self.kicad_output_dir).grid(
-            row=1, column=1, columnspan=2, sticky="ew", padx=10, pady=5
-        )
-        tk.Button(
-            self.kicad_frame, text="浏览...", command=self.select_kicad_output_dir
-        ).grid(row=1, column=3, padx=10, pady=5)
-
-        # KiCad CLI路径
-        tk.Label(self.kicad_frame, text="KiCad CLI 路径:").grid(
-            row=2, column=0, sticky="w", padx=10, pady=5
-        )
-        tk.Entry(self.kicad_frame, textvariable=self.kicad_cli_path).grid(
-            row=2, column=1, sticky="ew", padx=10, pady=5
-        )
-        tk.Button(
-            self.kicad_frame, text="浏览...", command=self.select_kicad_cli_path
-        ).grid(row=2, column=2, padx=10, pady=5)
-        tk.Button(
-            self.kicad_frame, text="自动检测", command=self.auto_detect_kicad_cli
-        ).grid(row=2, column=3, padx=10, pady=5)
+        # 文件/目录输入行：(标签, 变量, 浏览命令, 输入框跨列数, 附加按钮)
+        rows = [
+            (
+                "KiCad 项目文件:",
+                self.kicad_project_file,
+                self.select_kicad_project_file,
+                2,
+                None,
+            ),
+            ("输出目录:", self.kicad_output_dir, self.select_kicad_output_dir, 2, None),
+            (
+                "KiCad CLI 路径:",
+                self.kicad_cli_path,
+                self.select_kicad_cli_path,
+                1,
+                ("自动检测", self.auto_detect_kicad_cli),
+            ),
+        ]
+        for row, (label, var, browse_cmd, entry_span, extra_btn) in enumerate(rows):
+            self._add_row(
+                self.kicad_frame, row, label, var, browse_cmd, extra_btn, entry_span
+            )
 
         # Gerber层配置
         tk.Label(self.kicad_frame, text="Gerber 层配置:").grid(
@@ -336,17 +400,15 @@ class BOMTransformGUI:
         gerber_combo.bind("<<ComboboxSelected>>", self._on_gerber_layers_change)
 
         # 选项
-        tk.Checkbutton(
-            self.kicad_frame, text="跳过 ERC/DRC 检查", variable=self.kicad_skip_checks
-        ).grid(row=4, column=0, columnspan=4, sticky="w", padx=10, pady=5)
-        tk.Checkbutton(
-            self.kicad_frame, text="跳过文件导出", variable=self.kicad_skip_exports
-        ).grid(row=5, column=0, columnspan=4, sticky="w", padx=10, pady=5)
-        tk.Checkbutton(
-            self.kicad_frame,
-            text="导出模式 (检查但只看文件导出结果)",
-            variable=self.kicad_export_mode,
-        ).grid(row=6, column=0, columnspan=4, sticky="w", padx=10, pady=5)
+        options = [
+            ("跳过 ERC/DRC 检查", self.kicad_skip_checks),
+            ("跳过文件导出", self.kicad_skip_exports),
+            ("导出模式 (检查但只看文件导出结果)", self.kicad_export_mode),
+        ]
+        for row, (text, var) in enumerate(options, start=4):
+            tk.Checkbutton(self.kicad_frame, text=text, variable=var).grid(
+                row=row, column=0, columnspan=4, sticky="w", padx=10, pady=5
+            )
 
         # 运行按钮
         tk.Button(
@@ -362,7 +424,7 @@ class BOMTransformGUI:
             row=8, column=0, columnspan=4, sticky="w", padx=10, pady=5
         )
         self.kicad_output_text = scrolledtext.ScrolledText(
-            self.kicad_frame, height=12, state="disabled"
+            self.kicad_frame, height=12, state="disabled", undo=False, maxundo=0
         )
         self.kicad_output_text.grid(
             row=9, column=0, columnspan=4, padx=10, pady=5, sticky="nsew"
@@ -395,6 +457,10 @@ class BOMTransformGUI:
             self.bom_mapping_file.set(file_path)
 
     def run_bom_transform(self):
+        bom = self._get_bom_module()
+        if bom is None:
+            return
+
         # 验证输入
         if not self.bom_input_file.get():
             messagebox.showerror("错误", "请选择输入 CSV 文件")
@@ -421,19 +487,28 @@ class BOMTransformGUI:
             messagebox.showerror("错误", f"无法创建输出目录: {e}")
             return
 
-        # 构建参数
-        args = ["--input", self.bom_input_file.get(), "--output-dir", output_dir]
-
-        if self.bom_project_name.get():
-            args.extend(["--project-name", self.bom_project_name.get()])
-
-        if self.bom_mapping_file.get():
-            args.extend(["--mapping", self.bom_mapping_file.get()])
-
-        if self.bom_quiet.get():
-            args.append("--quiet")
+        # 未指定 mapping 时复用首次加载的默认配置
+        mapping_file = self.bom_mapping_file.get()
+        if mapping_file:
+            cfg = bom.load_config(mapping_file)
+        else:
+            if self.bom_default_cfg is None:
+                self.bom_default_cfg = bom.load_config(None)
+            cfg = self.bom_default_cfg
+
+        # 直接调用 transform_file，跳过 argparse
+        def run_bom(_args):
+            return bom.transform_file(
+                self.bom_input_file.get(),
+                cfg,
+                output_dir,
+                project_name=self.bom_project_name.get() or None,
+                quiet=self.bom_quiet.get(),
+            )
 
-        self.run_command(bom_main, args, "BOM转换", self.bom_output_text)
+        self.run_command(
+            run_bom, [], "BOM转换", self.bom_output_text, self.bom_run_button
+        )
 
     # KiCad导出相关方法
     def select_kicad_project_file(self):
@@ -470,20 +545,43 @@ class BOMTransformGUI:
         else:
             self.custom_layers_entry.config(state="disabled")
 
+    def _load_cli_cache(self) -> Optional[str]:
+        """读取 kicad_export 缓存的 KiCad CLI 路径，缓存缺失或已失效时返回 None
+
+        GUI 与 kicad_export 共用同一份缓存（见 kicad_export.CLI_CACHE_FILE），
+        kicad_export 不依赖 pandas 等大型库，启动时导入不会明显拖慢窗口显示。
+        """
+        module = self._get_kicad_module(quiet=True)
+        return module.cached_kicad_cli() if module is not None else None
+
+    def _save_cli_cache(self, cli_path: str):
+        """把检测到的 KiCad CLI 写入 kicad_export 的缓存"""
+        module = self._get_kicad_module(quiet=True)
+        if module is not None:
+            module.remember_kicad_cli(cli_path)
+
     def auto_detect_kicad_cli_on_startup(self):
-        """启动时自动检测KiCad CLI路径（静默模式）"""
+        """启动时自动检测KiCad CLI路径（静默模式，优先使用缓存）"""
+        cached_path = self._load_cli_cache()
+        if cached_path:
+            self.kicad_cli_path.set(cached_path)
+            print(f"启动时使用缓存的 KiCad CLI: {cached_path}")
+            return
+
         detected_path = self.detect_kicad_cli()
         if detected_path:
             self.kicad_cli_path.set(detected_path)
+            self._save_cli_cache(detected_path)
             print(f"启动时自动检测到 KiCad CLI: {detected_path}")
         else:
             print("启动时未检测到 KiCad CLI，请手动指定路径")
 
     def auto_detect_kicad_cli(self):
-        """自动检测KiCad CLI路径（显示消息框）"""
+        """自动检测KiCad CLI路径（显示消息框，忽略缓存强制重新探测）"""
         detected_path = self.detect_kicad_cli()
         if detected_path:
             self.kicad_cli_path.set(detected_path)
+            self._save_cli_cache(detected_path)
             messagebox.showinfo("检测成功", f"已自动检测到 KiCad CLI:\n{detected_path}")
         else:
             messagebox.showwarning(
@@ -491,6 +589,10 @@ class BOMTransformGUI:
             )
 
     def run_kicad_export(self):
+        kicad_main = self._get_kicad_main()
+        if kicad_main is None:
+            return
+
         # 验证输入
         if not self.kicad_project_file.get():
             messagebox.showerror("错误", "请选择 KiCad 项目文件")
@@ -500,16 +602,9 @@ class BOMTransformGUI:
             messagebox.showerror("错误", "项目文件不存在")
             return
 
-        # 处理输出目录：先删除再创建
+        # 处理输出目录：保留已有内容（含 .cache 结果缓存），输入未变化的步骤直接复用；
+        # 需要重新生成的文件由 kicad_export 在导出前删除
         output_dir = self.kicad_output_dir.get()
-        if os.path.exists(output_dir):
-            try:
-                shutil.rmtree(output_dir)
-                print(f"已删除现有输出目录: {output_dir}")
-            except OSError as e:
-                messagebox.showerror("错误", f"无法删除输出目录: {e}")
-                return
-
         try:
             os.makedirs(output_dir, exist_ok=True)
             print(f"创建输出目录: {output_dir}")
@@ -542,7 +637,9 @@ class BOMTransformGUI:
         self.kicad_output_text.config(state="disabled")
 
         # 构建参数
-        args = [self.kicad_project_file.get(), "--output", self.kicad_output_dir.get()]
+        # 传入绝对路径，保证同一项目在不同工作目录下得到一致的路径（便于按路径缓存）
+        project_file = os.path.abspath(self.kicad_project_file.get())
+        args = [project_file, "--output", self.kicad_output_dir.get()]
 
         if self.kicad_cli_path.get():
             args.extend(["--kicad-cli", self.kicad_cli_path.get()])
@@ -567,22 +664,22 @@ class BOMTransformGUI:
         # 默认层不需要添加参数
 
         # 在后台线程中运行导出
-        thread = threading.Thread(target=self._run_kicad_export_thread, args=(args,))
+        thread = threading.Thread(
+            target=self._run_kicad_export_thread, args=(kicad_main, args)
+        )
         thread.daemon = True
         thread.start()
 
-    def _run_kicad_export_thread(self, args):
+    def _run_kicad_export_thread(self, kicad_main, args):
         """在后台线程中运行KiCad导出"""
         result = None
         output = ""
         output_buffer = None
 
         try:
-            # 重定向 stdout 和 stderr
+            # 重定向本线程的 stdout 和 stderr
             output_buffer = io.StringIO()
-            with contextlib.redirect_stdout(output_buffer), contextlib.redirect_stderr(
-                output_buffer
-            ):
+            with self._redirect_thread_output(output_buffer):
                 # kicad_main 不接受参数，使用 sys.argv
                 old_argv = sys.argv
                 sys.argv = ["kicad_export.py"] + args
@@ -652,12 +749,15 @@ class BOMTransformGUI:
 
         messagebox.showerror("错误", f"运行时错误: {error_msg}")
 
-    def run_command(self, main_func, args, operation_name, output_text=None):
+    def run_command(
+        self, main_func, args, operation_name, output_text=None, run_button=None
+    ):
+        """在后台线程中运行 main_func(args)，输出实时追加到输出框"""
         # 如果没有指定输出框，使用默认的
         if output_text is None:
             if not hasattr(self, "output_text"):
                 self.output_text = scrolledtext.ScrolledText(
-                    self.root, width=80, height=15
+                    self.root, width=80, height=15, undo=False, maxundo=0
                 )
                 self.output_text.pack(fill="both", expand=True, padx=10, pady=10)
             output_text = self.output_text
@@ -667,33 +767,87 @@ class BOMTransformGUI:
         output_text.delete(1.0, tk.END)
         output_text.config(state="disabled")
 
-        # 运行命令，捕获输出
+        # 禁用运行按钮，避免重复点击
+        if run_button is not None:
+            run_button.config(state="disabled")
+
+        thread = threading.Thread(
+            target=self._run_command_thread,
+            args=(main_func, args, operation_name, output_text, run_button),
+        )
+        thread.daemon = True
+        thread.start()
+
+    def _run_command_thread(
+        self, main_func, args, operation_name, output_text, run_button
+    ):
+        """后台线程：运行命令，stdout/stderr 经队列实时转发到主线程"""
+        result = None
+        error = None
+        writer = _QueueWriter(self.update_queue, output_text)
         try:
-            # 重定向 stdout 和 stderr
-            output_buffer = io.StringIO()
-            with contextlib.redirect_stdout(output_buffer), contextlib.redirect_stderr(
-                output_buffer
-            ):
+            with self._redirect_thread_output(writer):
                 result = main_func(args)
+        except Exception as e:
+            error = str(e)
 
-            output = output_buffer.getvalue()
+        self.update_queue.put(
+            ("command_done", output_text, operation_name, result, error, run_button)
+        )
 
-            output_text.config(state="normal")
-            if result == 0:
-                output_text.insert(tk.END, f"{operation_name}成功完成！\n\n")
-            else:
-                output_text.insert(
-                    tk.END, f"{operation_name}失败，退出代码: {result}\n\n"
-                )
+    @contextlib.contextmanager
+    def _redirect_thread_output(self, writer):
+        """把当前线程的 stdout/stderr 写入 writer，不影响其他线程
+
+        BOM 转换与 KiCad 导出可能同时在各自的线程中运行，
+        contextlib.redirect_stdout 会替换全局 sys.stdout 导致输出串到另一个窗口。
+        kicad_export 无法导入时只有 BOM 转换能运行，才退回全局重定向。
+        """
+        if self._stdout is None:
+            with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+                yield
+            return
+        with self._stdout.redirect(writer), self._stderr.redirect(writer):
+            yield
 
-            output_text.insert(tk.END, output)
-            output_text.config(state="disabled")
+    def _append_output(self, output_text, text):
+        """追加输出到输出框"""
+        output_text.config(state="normal")
+        output_text.insert(tk.END, text)
+        output_text.see(tk.END)
+        output_text.config(state="disabled")
 
-        except Exception as e:
-            output_text.config(state="normal")
-            output_text.insert(tk.END, f"运行时错误: {str(e)}\n")
-            output_text.config(state="disabled")
-            messagebox.showerror("错误", f"运行时错误: {str(e)}")
+    def _finish_command(self, output_text, operation_name, result, error, run_button):
+        """命令结束：显示结果并重新启用运行按钮"""
+        if error is not None:
+            self._append_output(output_text, f"\n运行时错误: {error}\n")
+            messagebox.showerror("错误", f"运行时错误: {error}")
+        elif result == 0:
+            self._append_output(output_text, f"\n{operation_name}成功完成！\n")
+        else:
+            self._append_output(
+                output_text, f"\n{operation_name}失败，退出代码: {result}\n"
+            )
+
+        if run_button is not None:
+            run_button.config(state="normal")
+
+
+class _QueueWriter(io.TextIOBase):
+    """把写入的文本转发到 GUI 更新队列（由主线程取出并显示）"""
+
+    def __init__(self, update_queue: queue.Queue, output_text):
+        super().__init__()
+        self.update_queue = update_queue
+        self.output_text = output_text
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        if s:
+            self.update_queue.put(("command_output", self.output_text, s))
+        return len(s)
 
 
 def main():
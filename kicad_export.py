@@ -21,6 +21,11 @@ KiCad 自动化导出脚本 (KiCad 9.0+)
     --skip-checks         跳过 ERC/DRC 检查
     --skip-exports        跳过文件导出 (仅运行检查)
     --export-mode         导出模式 (运行检查但不影响退出码)
+    --no-cache, --force   忽略输入未变化时的结果缓存，强制重新运行
+    -j, --jobs            并行运行的 kicad-cli 任务数 (默认: CPU 核数，1 为顺序执行)
+    --gerber-compress     Gerber 压缩包的压缩方式 (deflate/bzip2/lzma/store，默认 deflate)
+    --no-cli-cache        忽略已缓存的 KiCad CLI 检测结果，重新查找 kicad-cli
+    --no-summary          不生成构建摘要 (build_summary.md)
 
 运行模式：
     1. 完整模式 (默认)
@@ -41,6 +46,7 @@ KiCad 自动化导出脚本 (KiCad 9.0+)
 
 输出文件：
     outputs/
+    ├── .cache/                    # 结果缓存 (输入未变化时跳过重复运行)
     ├── erc_report.json            # ERC 检查报告
     ├── drc_report.json            # DRC 检查报告
     ├── build_summary.md           # 构建摘要
@@ -104,11 +110,46 @@ KiCad 自动化导出脚本 (KiCad 9.0+)
 
 import os
 import sys
+import platform
+import io
 import json
+import hashlib
+import tempfile
+import functools
+import mmap
+import re
+import shutil
 import subprocess
 import argparse
+import contextlib
+import dataclasses
+import threading
+import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Tuple, Optional, List
+from typing import Callable, Iterator, Tuple, Optional, List
+
+# 可选：ijson 流式解析 ERC/DRC 报告，未安装时回退到 json.load
+try:
+    import ijson  # type: ignore
+except Exception:
+    ijson = None
+
+# 可选：orjson（C 实现）一次性解析报告，比 json.load 快
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+# ijson 使用 C 后端 (yajl2_c) 时流式解析；纯 Python 后端较慢，有 orjson 时改用 orjson
+_STREAM_REPORTS = ijson is not None and (
+    orjson is None or ijson.backend.startswith("yajl2_c")
+)
+
+# 报告解析失败时可能抛出的异常
+_JSON_ERRORS = (json.JSONDecodeError,) + ((ijson.JSONError,) if ijson else ())
 
 
 DEFAULT_GERBER_LAYERS: List[str] = [
@@ -123,6 +164,333 @@ DEFAULT_GERBER_LAYERS: List[str] = [
     "Edge.Cuts",
 ]
 
+# 构建成功所必需的导出项（results["exports"] 的键）
+REQUIRED_EXPORTS = (
+    "schematic_pdf",
+    "bom",
+    "gerber_zip",
+    "pcb_front_svg",
+    "pcb_back_svg",
+    "step_3d",
+)
+_REQUIRED_EXPORT_SET = frozenset(REQUIRED_EXPORTS)
+
+
+def _failed_exports(exports: dict) -> List[str]:
+    """未成功导出的必需项（按 REQUIRED_EXPORTS 顺序），全部成功时为空列表"""
+    missing = _REQUIRED_EXPORT_SET - {key for key, ok in exports.items() if ok}
+    if not missing:
+        return []
+    return [key for key in REQUIRED_EXPORTS if key in missing]
+
+
+# BOM 导出字段、输出标签与分组字段（kicad-cli sch export bom）
+BOM_FIELDS = (
+    "Description,Reference,${QUANTITY},Value,Category,Part-DB IPN,lcsc#,manf,manf#"
+)
+BOM_LABELS = "描述,Reference,Qty,Value,Category,Part-DB IPN,lcsc#,manf,manf#"
+BOM_GROUP_BY = "Value,Description,Category,Part-DB IPN,lcsc#,manf,manf#"
+
+# PCB 正/背面 SVG 图像包含的层
+PCB_FRONT_LAYERS = "F.Cu,F.Mask,F.Silkscreen,Edge.Cuts"
+PCB_BACK_LAYERS = "B.Cu,B.Mask,B.Silkscreen,Edge.Cuts"
+
+# STEP 导出参数：排除 DNP 元件、以钻孔原点为原点、替换 3D 模型
+STEP_EXPORT_ARGS = (
+    "--no-dnp",
+    "--drill-origin",
+    "--subst-models",
+    "--min-distance",
+    "0.01mm",
+)
+
+# Gerber 压缩包的 deflate 级别：Gerber/Excellon 为高度重复的 ASCII 文本，
+# 级别 1 已能得到接近默认级别 (6) 的压缩率，CPU 耗时明显更少
+GERBER_ZIP_COMPRESSLEVEL = 1
+
+# --gerber-compress 可选的压缩方式 -> zipfile 常量名；lzma/bzip2 压缩率更高但更耗 CPU
+GERBER_ZIP_METHODS = {
+    "deflate": "ZIP_DEFLATED",
+    "bzip2": "ZIP_BZIP2",
+    "lzma": "ZIP_LZMA",
+    "store": "ZIP_STORED",
+}
+
+# 原理图中层次子图的文件引用：(property "Sheetfile" "<路径>" ...)，字符串内用 \ 转义
+_SHEETFILE_RE = re.compile(rb'\(property\s+"Sheetfile"\s+"((?:[^"\\]|\\.)*)"')
+_SEXPR_ESCAPE_RE = re.compile(rb"\\(.)")
+
+# wxWidgets 在 stderr 中输出的调试信息（不属于命令错误），匹配整行（含换行符）
+_WX_DEBUG_RE = re.compile(
+    r"(?m)^.*(?:Adding duplicate image handler|Debug: Adding duplicate).*\n?"
+)
+
+# 自动检测到的 KiCad CLI 缓存（路径 + 版本），可执行文件被移除或修改后失效
+CLI_CACHE_FILE = Path.home() / ".cache" / "kicad_export" / "cli.json"
+
+
+@functools.lru_cache(maxsize=4)
+def _probe_kicad_cli(cmd: str) -> Optional[str]:
+    """运行 `<cmd> version`，成功时返回版本号，否则返回 None（同一进程内按命令缓存）"""
+    result = subprocess.run([cmd, "version"], capture_output=True, text=True, timeout=5)
+    if result.returncode == 0:
+        return result.stdout.strip()
+    return None
+
+
+def _version_sort_key(path: str) -> List[int]:
+    """版本目录（如 .../KiCad/10.0）的排序键"""
+    name = os.path.basename(path)
+    return [int(n) if n.isdigit() else 0 for n in name.split(".")]
+
+
+def kicad_cli_candidates() -> List[str]:
+    """自动检测的候选命令：PATH 中的命令名，Windows 上再加常见安装目录（新版本优先）
+
+    GUI 探测 KiCad CLI 时也使用这份列表。
+    """
+    candidates = ["kicad-cli", "kicad.kicad-cli"]
+    if sys.platform.startswith("win"):
+        roots = [Path(os.environ.get("ProgramFiles", "C:\\Program Files")) / "KiCad"]
+        if os.environ.get("LOCALAPPDATA"):
+            roots.append(Path(os.environ["LOCALAPPDATA"]) / "Programs" / "KiCad")
+        for root in roots:
+            try:
+                with os.scandir(root) as it:
+                    versions = [e.path for e in it if e.is_dir(follow_symlinks=False)]
+            except OSError:
+                continue
+            # 按版本号（如 10.0 > 9.0）而不是字符串从高到低排列
+            versions.sort(key=_version_sort_key, reverse=True)
+            for version_dir in versions:
+                exe = os.path.join(version_dir, "bin", "kicad-cli.exe")
+                if os.path.isfile(exe):
+                    candidates.append(exe)
+    # 去重并保持顺序
+    return list(dict.fromkeys(candidates))
+
+
+def _sheet_files(sch_file: Path) -> List[Path]:
+    """原理图中引用的层次子图文件（路径相对于引用它的原理图所在目录）"""
+    try:
+        data = sch_file.read_bytes()
+    except OSError:
+        return []
+    sheets = []
+    for match in _SHEETFILE_RE.finditer(data):
+        name = _SEXPR_ESCAPE_RE.sub(rb"\1", match.group(1)).decode("utf-8", "replace")
+        sheet = Path(os.path.normpath(sch_file.parent / name))
+        if sheet.is_file():
+            sheets.append(sheet)
+    return sheets
+
+
+def _iter_files(root) -> Iterator[os.DirEntry]:
+    """递归遍历目录下的文件（DirEntry 自带类型信息，无需逐个 stat）"""
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def _read_cli_cache_file() -> dict:
+    """读取 CLI 缓存文件，不存在或损坏时返回空字典"""
+    try:
+        with open(CLI_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_cli_cache_file(data: dict):
+    """原子写入 CLI 缓存文件（失败时忽略）"""
+    try:
+        CLI_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=CLI_CACHE_FILE.parent,
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            json.dump(data, f)
+        os.replace(f.name, CLI_CACHE_FILE)
+    except OSError:
+        pass
+
+
+def _load_cli_cache() -> Optional[Tuple[str, Optional[str]]]:
+    """读取仍然有效的 CLI 缓存，返回 (命令, 版本)
+
+    缓存只在同一平台上使用，且可执行文件仍然存在、mtime 未变化。
+    """
+    entry = _read_cli_cache_file()
+    try:
+        cmd, version, mtime_ns = entry["cli"], entry["version"], entry["mtime"]
+        if entry["platform"] != sys.platform:
+            return None
+        if os.stat(cmd).st_mtime_ns != mtime_ns:
+            return None
+    except (KeyError, TypeError, OSError):
+        return None
+    return cmd, version
+
+
+def _save_cli_cache(cmd: str, version: Optional[str]):
+    """保存 CLI 检测结果（保留已记录的版本号）"""
+    try:
+        mtime_ns = os.stat(cmd).st_mtime_ns
+    except OSError:
+        return
+    data = _read_cli_cache_file()
+    data.update(
+        {
+            "cli": cmd,
+            "version": version,
+            "mtime": mtime_ns,
+            "platform": sys.platform,
+        }
+    )
+    _write_cli_cache_file(data)
+
+
+def cached_kicad_cli() -> Optional[str]:
+    """缓存中仍然有效的 KiCad CLI 路径（GUI 与命令行共用同一份缓存）"""
+    cached = _load_cli_cache()
+    return cached[0] if cached else None
+
+
+def remember_kicad_cli(cmd: str):
+    """把调用方检测到的 KiCad CLI 写入缓存（命令名按 PATH 解析为绝对路径）"""
+    resolved = shutil.which(cmd)
+    if resolved:
+        resolved = os.path.abspath(resolved)
+        _save_cli_cache(resolved, _read_kicad_version(resolved))
+
+
+def _cli_binary_key(cmd: str) -> Optional[str]:
+    """可执行文件的身份标识（真实路径 + mtime），找不到时返回 None"""
+    exe = shutil.which(cmd)
+    if not exe:
+        return None
+    try:
+        return f"{os.path.realpath(exe)}|{os.stat(exe).st_mtime_ns}"
+    except OSError:
+        return None
+
+
+def _read_kicad_version(cmd: str) -> Optional[str]:
+    """不启动 kicad-cli 读取版本号
+
+    macOS 上读取 KiCad.app 的 Info.plist；其他平台读取按可执行文件
+    （路径 + mtime）记录的版本号，升级 KiCad 后自动失效。
+    """
+    exe = shutil.which(cmd)
+    if not exe:
+        return None
+    contents = Path(os.path.realpath(exe)).parent.parent
+    plist_file = contents / "Info.plist"
+    if sys.platform == "darwin" and plist_file.is_file():
+        import plistlib
+
+        try:
+            with open(plist_file, "rb") as f:
+                version = plistlib.load(f).get("CFBundleShortVersionString")
+        except (OSError, ValueError):
+            version = None
+        if version:
+            return str(version)
+
+    key = _cli_binary_key(cmd)
+    versions = _read_cli_cache_file().get("versions")
+    if key and isinstance(versions, dict) and versions.get(key):
+        return versions[key]
+    return None
+
+
+def _kicad_cli_version(cmd: str) -> Optional[str]:
+    """获取 kicad-cli 版本号：优先读取文件，失败时才运行 `version` 并记录结果"""
+    version = _read_kicad_version(cmd)
+    if version is not None:
+        return version
+
+    version = _probe_kicad_cli(cmd)
+    key = _cli_binary_key(cmd)
+    if version is not None and key:
+        data = _read_cli_cache_file()
+        versions = data.get("versions")
+        if not isinstance(versions, dict):
+            versions = {}
+        versions[key] = version
+        data["versions"] = versions
+        _write_cli_cache_file(data)
+    return version
+
+
+@dataclasses.dataclass
+class CheckSummary:
+    """ERC/DRC 检查结果统计"""
+
+    status: str  # passed / failed
+    violations: int
+    errors: int
+    warnings: int
+    exclusions: int
+
+
+class ThreadRoutedStream(io.TextIOBase):
+    """按线程分流的输出流：绑定了写入目标的线程写入该目标，其他线程写入原始流
+
+    sys.stdout / sys.stderr 只在 install 时替换一次，之后各线程通过 redirect
+    绑定自己的写入目标，不影响其他线程；GUI 的后台任务也使用同一实现。
+    """
+
+    def __init__(self, target):
+        super().__init__()
+        self._target = target
+        self._local = threading.local()
+
+    @classmethod
+    def install(cls, name: str) -> "ThreadRoutedStream":
+        """替换 sys.<name>（已替换时直接返回现有实例）"""
+        stream = getattr(sys, name)
+        if not isinstance(stream, cls):
+            stream = cls(stream)
+            setattr(sys, name, stream)
+        return stream
+
+    @contextlib.contextmanager
+    def redirect(self, writer):
+        """with 块内当前线程的输出写入 writer，退出时恢复之前的目标（可嵌套）"""
+        previous = getattr(self._local, "writer", None)
+        self._local.writer = writer
+        try:
+            yield writer
+        finally:
+            self._local.writer = previous
+
+    def _current(self):
+        writer = getattr(self._local, "writer", None)
+        return writer if writer is not None else self._target
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        stream = self._current()
+        # pythonw 下没有控制台，原始流为 None
+        if stream is None:
+            return len(s)
+        return stream.write(s)
+
+    def flush(self):
+        stream = self._current()
+        if stream is not None:
+            stream.flush()
+
 
 class KiCadExporter:
     def __init__(
@@ -131,23 +499,54 @@ class KiCadExporter:
         output_dir: str = "outputs",
         kicad_cli_path: Optional[str] = None,
         gerber_layers: Optional[str] = None,
+        use_cache: bool = True,
+        gerber_compress: str = "deflate",
+        use_cli_cache: bool = True,
     ):
         self.project_path = Path(project_path)
         self.project_name = self.project_path.stem
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
 
-        # 检测KiCad CLI命令
-        self.kicad_cli = self._detect_kicad_cli(kicad_cli_path)
+        # 结果缓存：输入文件内容与命令参数均未变化时跳过 kicad-cli 调用
+        # 可通过 --no-cache/--force 或环境变量 KICAD_EXPORT_NO_CACHE=1 关闭
+        self.use_cache = use_cache and os.getenv("KICAD_EXPORT_NO_CACHE", "") in {
+            "",
+            "0",
+        }
+        self.cache_dir = self.output_dir / ".cache"
+        # 输入文件摘要按 (mtime, 大小) 记录在 .cache/digests.json 中
+        self._digests: Optional[dict] = None
+        self._digests_dirty = False
+        self._digest_lock = threading.Lock()
+
+        # 检测KiCad CLI命令（版本号缓存在 _kicad_version 中，见 _get_kicad_version）
+        self._kicad_version: Optional[str] = None
+        self._version_lock = threading.Lock()
+        self.kicad_cli = self._detect_kicad_cli(kicad_cli_path, use_cli_cache)
 
         # Gerber层配置
         self.gerber_layers = self._resolve_gerber_layers(gerber_layers)
+        # kicad-cli --layers 参数（None 表示导出全部层）
+        self._gerber_layers_arg = (
+            ",".join(self.gerber_layers) if self.gerber_layers else None
+        )
+        if gerber_compress not in GERBER_ZIP_METHODS:
+            raise ValueError(f"不支持的Gerber压缩方式: {gerber_compress}")
+        self.gerber_compress = gerber_compress
 
         # 文件路径
         self.sch_file = self.project_path.with_suffix(".kicad_sch")
         self.pcb_file = self.project_path.with_suffix(".kicad_pcb")
-
-        # 结果统计
+        # 输入文件在运行期间不会出现或消失，只检查一次
+        self._sch_exists = self.sch_file.exists()
+        self._pcb_exists = self.pcb_file.exists()
+        # kicad-cli 参数中的输入文件路径（只转换一次）
+        self._sch_arg = str(self.sch_file)
+        self._pcb_arg = str(self.pcb_file)
+
+        # 结果统计（并行任务通过 _results_lock 写入）
+        self._results_lock = threading.Lock()
         self.results = {
             "erc": {"status": "skipped", "violations": 0},
             "drc": {"status": "skipped", "violations": 0},
@@ -179,76 +578,254 @@ class KiCadExporter:
         print("ℹ Gerber层设置: 使用默认层 (" + ", ".join(DEFAULT_GERBER_LAYERS) + ")")
         return DEFAULT_GERBER_LAYERS.copy()
 
-    def _detect_kicad_cli(self, custom_path: Optional[str] = None) -> str:
-        """检测可用的KiCad CLI命令"""
-        # 如果指定了自定义路径，优先使用
+    def _detect_kicad_cli(
+        self, custom_path: Optional[str] = None, use_cli_cache: bool = True
+    ) -> str:
+        """检测可用的KiCad CLI命令
+
+        自动检测只用 shutil.which 解析路径，结果缓存在 CLI_CACHE_FILE 中
+        （可执行文件不变时一直有效，use_cli_cache=False 时重新检测）；
+        版本号优先从文件读取，读取不到时延迟到首次使用。
+        """
+        # 如果指定了自定义路径，优先使用（可执行性用 os.access 快速判断）
         if custom_path:
-            if Path(custom_path).exists():
-                try:
-                    result = subprocess.run(
-                        [custom_path, "version"],
-                        capture_output=True,
-                        text=True,
-                        timeout=5,
-                    )
-                    if result.returncode == 0:
-                        print(f"✓ 使用指定的KiCad CLI: {custom_path}")
-                        print(f"  版本: {result.stdout.strip()}")
-                        return custom_path
-                except (FileNotFoundError, subprocess.TimeoutExpired) as e:
-                    raise RuntimeError(
-                        f"错误: 指定的KiCad CLI路径无效: {custom_path} - {e}"
-                    )
-            else:
+            if not Path(custom_path).exists():
                 raise RuntimeError(f"错误: 指定的KiCad CLI路径不存在: {custom_path}")
-
-        # 尝试系统路径中的命令
-        commands = ["kicad-cli", "kicad.kicad-cli"]
-
-        for cmd in commands:
+            if not os.access(custom_path, os.X_OK):
+                raise RuntimeError(f"错误: 指定的KiCad CLI路径无效: {custom_path}")
             try:
-                result = subprocess.run(
-                    [cmd, "version"], capture_output=True, text=True, timeout=5
+                version = _kicad_cli_version(custom_path)
+            except (OSError, subprocess.TimeoutExpired) as e:
+                raise RuntimeError(
+                    f"错误: 指定的KiCad CLI路径无效: {custom_path} - {e}"
                 )
-                if result.returncode == 0:
-                    print(f"✓ 检测到系统KiCad CLI: {cmd}")
-                    print(f"  版本: {result.stdout.strip()}")
-                    return cmd
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                continue
+            if version is not None:
+                self._kicad_version = version
+                print(f"✓ 使用指定的KiCad CLI: {custom_path}")
+                print(f"  版本: {self._kicad_version}")
+                return custom_path
+
+        cached = _load_cli_cache() if use_cli_cache else None
+        if cached:
+            cmd, self._kicad_version = cached
+            print(f"✓ 检测到系统KiCad CLI: {cmd} (缓存)")
+            if self._kicad_version:
+                print(f"  版本: {self._kicad_version}")
+            return cmd
+
+        # 在 PATH 及常见安装目录中查找（只做路径解析，不启动 kicad-cli）
+        candidates = kicad_cli_candidates()
+
+        for cmd in candidates:
+            resolved = shutil.which(cmd)
+            if resolved:
+                # 版本号在首次需要时由 _get_kicad_version 获取
+                self._kicad_version = _read_kicad_version(resolved)
+                _save_cli_cache(resolved, self._kicad_version)
+                print(f"✓ 检测到系统KiCad CLI: {resolved}")
+                if self._kicad_version:
+                    print(f"  版本: {self._kicad_version}")
+                return resolved
 
         raise RuntimeError(
             "错误: 未找到KiCad CLI命令\n"
             "  请安装KiCad或使用 --kicad-cli 参数指定路径\n"
-            "  尝试过: kicad-cli, kicad.kicad-cli"
+            f"  尝试过: {', '.join(candidates)}"
         )
 
+    def _get_kicad_version(self) -> Optional[str]:
+        """KiCad 版本号：首次调用时获取（必要时运行一次 `kicad-cli version`）"""
+        with self._version_lock:
+            if self._kicad_version is None:
+                try:
+                    self._kicad_version = _kicad_cli_version(self.kicad_cli)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            return self._kicad_version
+
+    @functools.cached_property
+    def _sch_inputs(self) -> List[Path]:
+        """原理图类任务的输入文件：项目文件 + 全部原理图（含层次子图）
+
+        除项目目录下的 *.kicad_sch 外，沿 Sheetfile 引用递归收集放在子目录中的子图。
+        输入文件在一次运行中不会变化，只收集一次。
+        """
+        sheets = set(self.project_path.parent.glob("*.kicad_sch"))
+        pending = list(sheets)
+        while pending:
+            for sheet in _sheet_files(pending.pop()):
+                if sheet not in sheets:
+                    sheets.add(sheet)
+                    pending.append(sheet)
+        return [self.project_path] + sorted(sheets)
+
+    @functools.cached_property
+    def _pcb_inputs(self) -> List[Path]:
+        """PCB 类任务的输入文件：项目文件 + PCB 文件（+ 自定义设计规则）"""
+        inputs = [self.project_path, self.pcb_file]
+        dru_file = self.project_path.with_suffix(".kicad_dru")
+        if dru_file.exists():
+            inputs.append(dru_file)
+        return inputs
+
+    @staticmethod
+    def _sha256_file(path: Path) -> str:
+        """计算文件内容的 SHA256（Python 3.11+ 用 file_digest，否则内存映射）"""
+        with open(path, "rb") as f:
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            h = hashlib.sha256()
+            # 空文件无法映射
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    h.update(mm)
+            return h.hexdigest()
+
+    def _input_digest(self, path: Path) -> str:
+        """输入文件的 SHA256
+
+        与 make 的时间戳判断类似：mtime 和大小都未变化时直接复用
+        digests.json 中记录的摘要，无需重新读取文件。
+        """
+        if not self.use_cache:
+            return self._sha256_file(path)
+
+        st = path.stat()
+        key = os.path.abspath(path)
+        with self._digest_lock:
+            if self._digests is None:
+                self._digests = self._read_cache_file("digests")
+            entry = self._digests.get(key)
+            if entry and entry[:2] == [st.st_mtime_ns, st.st_size]:
+                return entry[2]
+
+        digest = self._sha256_file(path)
+        with self._digest_lock:
+            self._digests[key] = [st.st_mtime_ns, st.st_size, digest]
+            self._digests_dirty = True
+        return digest
+
+    def _cache_fingerprint(self, commands: List[list], inputs: List[Path]) -> dict:
+        """任务指纹：输入文件内容摘要 + KiCad 版本 + 命令参数摘要
+
+        禁用缓存时指纹不会被使用，直接返回空字典，不计算输入文件摘要。
+        """
+        if not self.use_cache:
+            return {}
+        args_text = json.dumps(commands, ensure_ascii=False)
+        return {
+            "inputs": {
+                str(path): self._input_digest(path) for path in inputs if path.exists()
+            },
+            "kicad_version": self._get_kicad_version(),
+            "cli_args_hash": hashlib.sha256(args_text.encode("utf-8")).hexdigest(),
+        }
+
+    def _load_cache(self, op: str, fingerprint: dict, description: str) -> bool:
+        """缓存命中（指纹一致且产物均存在）时恢复结果并返回 True"""
+        if not self.use_cache:
+            return False
+
+        entry = self._read_cache_file(op)
+        if entry.get("fingerprint") != fingerprint:
+            return False
+        if not all(Path(artifact).exists() for artifact in entry.get("artifacts", [])):
+            return False
+
+        for section, value in entry.get("results", {}).items():
+            if section == "exports":
+                for key, exported in value.items():
+                    self._record_export(key, exported)
+            else:
+                self._record_check(section, value)
+
+        print(f"\n✓ {description} - 输入未变化，使用缓存结果")
+        return True
+
+    def _save_cache(
+        self, op: str, fingerprint: dict, artifacts: List[Path], results: dict
+    ):
+        """原子写入缓存条目（先写临时文件再替换）"""
+        if not self.use_cache:
+            return
+
+        entry = {
+            "fingerprint": fingerprint,
+            "artifacts": [str(artifact) for artifact in artifacts],
+            "results": results,
+        }
+        try:
+            self._write_cache_file(op, entry)
+            with self._digest_lock:
+                digests = dict(self._digests) if self._digests_dirty else None
+                self._digests_dirty = False
+            if digests is not None:
+                self._write_cache_file("digests", digests)
+        except OSError as e:
+            print(f"  ⚠ 写入缓存失败: {e}")
+
+    def _read_cache_file(self, name: str) -> dict:
+        """读取 .cache/<name>.json，不存在或损坏时返回空字典"""
+        try:
+            with open(self.cache_dir / f"{name}.json", "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write_cache_file(self, name: str, data: dict):
+        """原子写入 .cache/<name>.json（先写临时文件再替换）"""
+        self.cache_dir.mkdir(exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self.cache_dir, suffix=".tmp", delete=False
+        ) as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(f.name, self.cache_dir / f"{name}.json")
+
+    def _record_check(self, kind: str, result: dict):
+        """记录 ERC/DRC 检查结果（线程安全）"""
+        with self._results_lock:
+            self.results[kind] = result
+
+    def _record_export(self, key: str, exported: bool):
+        """记录导出结果（线程安全）"""
+        with self._results_lock:
+            self.results["exports"][key] = exported
+
     def _run_command(self, args: list, description: str) -> Tuple[bool, str]:
-        """运行命令并返回结果"""
+        """运行命令并返回结果
+
+        检查与导出的结果都写入文件，stdout 丢弃到 DEVNULL，
+        stderr 写入临时文件、仅在失败时读取用于报错。
+        """
         print(f"\n{'='*60}")
         print(f"执行: {description}")
         print(f"命令: {' '.join(args)}")
         print("=" * 60)
 
         try:
-            # 在Windows上明确指定UTF-8编码，避免GBK解码错误
-            result = subprocess.run(
-                args,
-                capture_output=True,
-                text=True,
-                timeout=120,
-                encoding="utf-8",
-                errors="replace",  # 遇到无法解码的字符时用替换字符
-            )
+            # stderr 直接写入临时文件，不经过管道；只有失败时才读取并解码
+            with tempfile.TemporaryFile() as stderr_file:
+                # 在Windows上明确指定UTF-8编码，避免GBK解码错误
+                result = subprocess.run(
+                    args,
+                    stdout=subprocess.DEVNULL,
+                    stderr=stderr_file,
+                    text=True,
+                    timeout=120,
+                    encoding="utf-8",
+                    errors="replace",  # 遇到无法解码的字符时用替换字符
+                )
 
-            # 过滤掉 wxWidgets 调试信息
-            filtered_stderr = self._filter_wx_debug(result.stderr)
+                if result.returncode == 0:
+                    print(f"✓ {description} - 成功")
+                    return True, ""
 
-            if result.returncode == 0:
-                print(f"✓ {description} - 成功")
-                return True, result.stdout
-            else:
-                return False, filtered_stderr
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode("utf-8", errors="replace")
+
+            # 过滤掉 wxWidgets 调试信息
+            return False, self._filter_wx_debug(stderr)
 
         except subprocess.TimeoutExpired:
             print(f"⚠ {description} - 超时")
@@ -262,176 +839,174 @@ class KiCadExporter:
         if not stderr:
             return ""
 
-        lines = stderr.split("\n")
-        filtered = []
+        return _WX_DEBUG_RE.sub("", stderr).strip()
 
-        for line in lines:
-            if any(
-                pattern in line
-                for pattern in [
-                    "Adding duplicate image handler",
-                    "Debug: Adding duplicate",
-                ]
-            ):
-                continue
-            filtered.append(line)
+    @staticmethod
+    def _iter_violations(report_file: Path) -> Iterator[dict]:
+        """逐条产出 ERC/DRC 报告中的违规项
 
-        return "\n".join(filtered).strip()
+        兼容不同版本的 JSON 结构：优先读取顶层 violations，
+        为空时读取 sheets[*].violations。ijson 可用时流式解析，
+        不在内存中构建完整的报告对象（见 _STREAM_REPORTS）；
+        否则用 orjson 或 json 一次性解析。
+        """
+        if not _STREAM_REPORTS:
+            if orjson is not None:
+                data = orjson.loads(report_file.read_bytes())
+            else:
+                with open(report_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            violations = data.get("violations") or []
+            if not violations:
+                for sheet in data.get("sheets", []):
+                    violations.extend(sheet.get("violations", []))
+            yield from violations
+            return
+
+        found = False
+        with open(report_file, "rb") as f:
+            for violation in ijson.items(f, "violations.item"):
+                found = True
+                yield violation
+        if found:
+            return
+        with open(report_file, "rb") as f:
+            yield from ijson.items(f, "sheets.item.violations.item")
+
+    @staticmethod
+    def _summarize_violations(violations) -> CheckSummary:
+        """单次遍历统计违规项，返回检查结果（有错误即为 failed）
+
+        error: 必须修复的错误；warning: 建议修复的警告；
+        excluded: 已被用户排除的问题
+        """
+        severities: Counter = Counter()
+        exclusions = 0
+        for v in violations:
+            severities[v.get("severity")] += 1
+            if v.get("excluded", False):
+                exclusions += 1
+
+        errors = severities["error"]
+        return CheckSummary(
+            status="failed" if errors > 0 else "passed",
+            violations=sum(severities.values()),
+            errors=errors,
+            warnings=severities["warning"],
+            exclusions=exclusions,
+        )
 
-    def run_erc(self) -> bool:
-        """运行ERC检查"""
-        if not self.sch_file.exists():
-            print(f"⚠ 跳过ERC: 原理图文件不存在 ({self.sch_file})")
-            return False
+    @staticmethod
+    def _print_check_result(summary: CheckSummary):
+        """打印检查结果统计"""
+        if summary.errors > 0:
+            print(f"  ✗ 发现 {summary.errors} 个错误, {summary.warnings} 个警告")
+        elif summary.warnings > 0:
+            print(f"  ⚠ 发现 {summary.warnings} 个警告（不影响通过）")
+        else:
+            print("  ✓ 未发现问题")
+
+    def _run_check(
+        self, kind: str, domain: str, source_arg: str, inputs: List[Path]
+    ) -> bool:
+        """运行 ERC/DRC 检查（kicad-cli <domain> <kind>）并记录结果
 
-        report_file = self.output_dir / "erc_report.json"
+        参数：
+            kind: "erc" 或 "drc"，同时作为结果键、缓存名和报告文件名前缀
+            domain: kicad-cli 子命令，"sch" 或 "pcb"
+            source_arg: 被检查的原理图/PCB 文件路径
+            inputs: 计算缓存指纹的输入文件
+        """
+        description = f"{kind.upper()}检查"
+        report_file = self.output_dir / f"{kind}_report.json"
 
         args = [
             self.kicad_cli,
-            "sch",
-            "erc",
+            domain,
+            kind,
             "--severity-all",
             "--format",
             "json",
             "--output",
             str(report_file),
-            str(self.sch_file),
+            source_arg,
         ]
 
-        success, output = self._run_command(args, "ERC检查")
+        fingerprint = self._cache_fingerprint([args], inputs)
+        if self._load_cache(kind, fingerprint, description):
+            return True
+
+        # 删除上次的报告，避免 kicad-cli 失败时把旧报告当作本次结果
+        report_file.unlink(missing_ok=True)
+        success, _ = self._run_command(args, description)
 
         if report_file.exists():
             try:
-                with open(report_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    sheets = data.get("sheets", [])
-                    violations = []
-                    for sheet in sheets:
-                        violations.extend(sheet.get("violations", []))
-
-                    # 统计不同严重级别的问题数量
-                    # error: 必须修复的错误
-                    # warning: 建议修复的警告
-                    # excluded: 已被用户排除的问题
-                    errors = sum(1 for v in violations if v.get("severity") == "error")
-                    warnings = sum(
-                        1 for v in violations if v.get("severity") == "warning"
-                    )
-                    exclusions = sum(1 for v in violations if v.get("excluded", False))
-                    total = len(violations)
-
-                    if errors > 0:
-                        self.results["erc"] = {
-                            "status": "failed",
-                            "violations": total,
-                            "errors": errors,
-                            "warnings": warnings,
-                            "exclusions": exclusions,
-                        }
-                        print(f"  ✗ 发现 {errors} 个错误, {warnings} 个警告")
-                    elif warnings > 0:
-                        self.results["erc"] = {
-                            "status": "passed",
-                            "violations": total,
-                            "errors": 0,
-                            "warnings": warnings,
-                            "exclusions": exclusions,
-                        }
-                        print(f"  ⚠ 发现 {warnings} 个警告（不影响通过）")
-                    else:
-                        self.results["erc"] = {
-                            "status": "passed",
-                            "violations": total,
-                            "errors": 0,
-                            "warnings": 0,
-                            "exclusions": exclusions,
-                        }
-                        print("  ✓ 未发现问题")
-
-            except json.JSONDecodeError as e:
+                summary = self._summarize_violations(self._iter_violations(report_file))
+                self._record_check(kind, dataclasses.asdict(summary))
+                self._print_check_result(summary)
+            except _JSON_ERRORS as e:
                 print(f"  ⚠ JSON解析失败: {e}")
-                self.results["erc"] = {"status": "error", "violations": "unknown"}
+                self._record_check(kind, {"status": "error", "violations": "unknown"})
+
+        if success and self.results[kind]["status"] in {"passed", "failed"}:
+            self._save_cache(
+                kind, fingerprint, [report_file], {kind: self.results[kind]}
+            )
 
         return True
 
+    def run_erc(self) -> bool:
+        """运行ERC检查"""
+        if not self._sch_exists:
+            print(f"⚠ 跳过ERC: 原理图文件不存在 ({self.sch_file})")
+            return False
+
+        return self._run_check("erc", "sch", self._sch_arg, self._sch_inputs)
+
     def run_drc(self) -> bool:
         """运行DRC检查"""
-        if not self.pcb_file.exists():
+        if not self._pcb_exists:
             print(f"⚠ 跳过DRC: PCB文件不存在 ({self.pcb_file})")
             return False
 
-        report_file = self.output_dir / "drc_report.json"
-
-        args = [
-            self.kicad_cli,
-            "pcb",
-            "drc",
-            "--severity-all",
-            "--format",
-            "json",
-            "--output",
-            str(report_file),
-            str(self.pcb_file),
-        ]
-
-        success, output = self._run_command(args, "DRC检查")
+        return self._run_check("drc", "pcb", self._pcb_arg, self._pcb_inputs)
 
-        if report_file.exists():
-            try:
-                with open(report_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    # 兼容不同版本的 JSON 结构
-                    violations = data.get("violations", [])
-                    if not violations:
-                        sheets = data.get("sheets", [])
-                        for sheet in sheets:
-                            violations.extend(sheet.get("violations", []))
-
-                    # 统计不同严重级别的问题数量
-                    errors = sum(1 for v in violations if v.get("severity") == "error")
-                    warnings = sum(
-                        1 for v in violations if v.get("severity") == "warning"
-                    )
-                    exclusions = sum(1 for v in violations if v.get("excluded", False))
-                    total = len(violations)
-
-                    if errors > 0:
-                        self.results["drc"] = {
-                            "status": "failed",
-                            "violations": total,
-                            "errors": errors,
-                            "warnings": warnings,
-                            "exclusions": exclusions,
-                        }
-                        print(f"  ✗ 发现 {errors} 个错误, {warnings} 个警告")
-                    elif warnings > 0:
-                        self.results["drc"] = {
-                            "status": "passed",
-                            "violations": total,
-                            "errors": 0,
-                            "warnings": warnings,
-                            "exclusions": exclusions,
-                        }
-                        print(f"  ⚠ 发现 {warnings} 个警告（不影响通过）")
-                    else:
-                        self.results["drc"] = {
-                            "status": "passed",
-                            "violations": total,
-                            "errors": 0,
-                            "warnings": 0,
-                            "exclusions": exclusions,
-                        }
-                        print("  ✓ 未发现问题")
-
-            except json.JSONDecodeError as e:
-                print(f"  ⚠ JSON解析失败: {e}")
-                self.results["drc"] = {"status": "error", "violations": "unknown"}
+    def _run_cached_export(
+        self,
+        key: str,
+        args: list,
+        output_file: Path,
+        inputs: List[Path],
+        description: str,
+        extra_fingerprint: tuple = (),
+        check_output: Callable[[Path], bool] = Path.exists,
+    ) -> bool:
+        """运行生成单个文件的导出命令并记录结果
+
+        输入与命令均未变化且文件仍在时使用缓存；否则先删除上次留下的文件，
+        使 check_output 只反映本次导出的结果，成功后写入缓存。
 
-        return True
+        参数：
+            key: 结果键，同时作为缓存名
+            extra_fingerprint: 命令参数之外影响产物的内容，一并计入指纹
+            check_output: 检查产物是否有效，默认只检查文件是否存在
+        """
+        fingerprint = self._cache_fingerprint([args, *extra_fingerprint], inputs)
+        if self._load_cache(key, fingerprint, description):
+            return True
+
+        output_file.unlink(missing_ok=True)
+        success, _ = self._run_command(args, description)
+        exported = check_output(output_file)
+        self._record_export(key, exported)
+        if success and exported:
+            self._save_cache(key, fingerprint, [output_file], {"exports": {key: True}})
+        return success
 
     def export_schematic_pdf(self) -> bool:
         """导出原理图PDF"""
-        if not self.sch_file.exists():
+        if not self._sch_exists:
             print(f"⚠ 跳过PDF导出: 原理图文件不存在")
             return False
 
@@ -444,12 +1019,12 @@ class KiCadExporter:
             "pdf",
             "--output",
             str(output_file),
-            str(self.sch_file),
+            self._sch_arg,
         ]
 
-        success, _ = self._run_command(args, "导出原理图PDF")
-        self.results["exports"]["schematic_pdf"] = output_file.exists()
-        return success
+        return self._run_cached_export(
+            "schematic_pdf", args, output_file, self._sch_inputs, "导出原理图PDF"
+        )
 
     def export_bom(self) -> bool:
         """导出BOM清单（CSV格式）
@@ -459,41 +1034,37 @@ class KiCadExporter:
         输出标签：描述, Reference, Qty, Value, Category,
                   Part-DB IPN, lcsc#, manf, manf#
         """
-        if not self.sch_file.exists():
+        if not self._sch_exists:
             print(f"⚠ 跳过BOM导出: 原理图文件不存在")
             return False
 
         output_file = self.output_dir / f"{self.project_name}-BOM.csv"
 
-        fields = "Description,Reference,${QUANTITY},Value,Category,Part-DB IPN,lcsc#,manf,manf#"
-        labels = "描述,Reference,Qty,Value,Category,Part-DB IPN,lcsc#,manf,manf#"
-        group_by = "Value,Description,Category,Part-DB IPN,lcsc#,manf,manf#"
-
         args = [
             self.kicad_cli,
             "sch",
             "export",
             "bom",
             "--fields",
-            fields,
+            BOM_FIELDS,
             "--labels",
-            labels,
+            BOM_LABELS,
             "--group-by",
-            group_by,
+            BOM_GROUP_BY,
             "--sort-field",
             "Reference",
             "--sort-asc",
             "--include-excluded-from-bom",
             "--output",
             str(output_file),
-            str(self.sch_file),
+            self._sch_arg,
         ]
 
-        success, _ = self._run_command(args, "导出BOM")
-        self.results["exports"]["bom"] = output_file.exists()
-        return success
+        return self._run_cached_export(
+            "bom", args, output_file, self._sch_inputs, "导出BOM"
+        )
 
-    def export_gerber(self) -> bool:
+    def export_gerber(self, jobs: Optional[int] = None) -> bool:
         """导出Gerber文件并打包为ZIP
 
         导出内容：
@@ -502,12 +1073,12 @@ class KiCadExporter:
         - 钻孔文件（Excellon 格式）
         - 自动打包为 ZIP 文件
         """
-        if not self.pcb_file.exists():
+        if not self._pcb_exists:
             print(f"⚠ 跳过Gerber导出: PCB文件不存在")
             return False
 
         gerber_dir = self.output_dir / "gerber"
-        gerber_dir.mkdir(exist_ok=True)
+        gerber_out = str(gerber_dir) + "/"
 
         args_gerber = [
             self.kicad_cli,
@@ -515,14 +1086,12 @@ class KiCadExporter:
             "export",
             "gerbers",
             "--output",
-            str(gerber_dir) + "/",
-            str(self.pcb_file),
+            gerber_out,
+            self._pcb_arg,
         ]
 
-        if self.gerber_layers:
-            args_gerber.extend(["--layers", ",".join(self.gerber_layers)])
-
-        success1, _ = self._run_command(args_gerber, "导出Gerber层文件")
+        if self._gerber_layers_arg:
+            args_gerber.extend(["--layers", self._gerber_layers_arg])
 
         args_drill = [
             self.kicad_cli,
@@ -532,35 +1101,66 @@ class KiCadExporter:
             "--format",
             "excellon",
             "--output",
-            str(gerber_dir) + "/",
-            str(self.pcb_file),
+            gerber_out,
+            self._pcb_arg,
         ]
 
-        success2, _ = self._run_command(args_drill, "导出钻孔文件")
+        zip_file = self.output_dir / f"{self.project_name}-Gerber.zip"
+        fingerprint = self._cache_fingerprint(
+            [args_gerber, args_drill, [self.gerber_compress]], self._pcb_inputs
+        )
+        if self._load_cache("gerber_zip", fingerprint, "导出Gerber文件包"):
+            return True
+
+        # 清空旧的层文件和压缩包，避免更换层配置后把上次的层一起打包
+        shutil.rmtree(gerber_dir, ignore_errors=True)
+        gerber_dir.mkdir()
+        zip_file.unlink(missing_ok=True)
+
+        # 层文件与钻孔文件由两个互不依赖的 kicad-cli 进程生成，按 jobs 并行
+        success1, success2 = self._run_tasks(
+            [
+                lambda: self._run_command(args_gerber, "导出Gerber层文件")[0],
+                lambda: self._run_command(args_drill, "导出钻孔文件")[0],
+            ],
+            jobs,
+        )
         if success1 and success2:
-            import zipfile
-
-            zip_file = self.output_dir / f"{self.project_name}-Gerber.zip"
-
-            with zipfile.ZipFile(zip_file, "w", zipfile.ZIP_DEFLATED) as zf:
-                for file in gerber_dir.rglob("*"):
-                    if file.is_file():
-                        zf.write(file, file.relative_to(gerber_dir))
+            compression = getattr(zipfile, GERBER_ZIP_METHODS[self.gerber_compress])
+            compresslevel = None
+            if compression == zipfile.ZIP_DEFLATED:
+                compresslevel = GERBER_ZIP_COMPRESSLEVEL
+            with zipfile.ZipFile(
+                zip_file, "w", compression, compresslevel=compresslevel
+            ) as zf:
+                # 循环内只做字符串运算，不为每个文件构造 Path
+                root_prefix = os.path.join(str(gerber_dir), "")
+                for entry in _iter_files(gerber_dir):
+                    arcname = entry.path[len(root_prefix) :].replace(os.sep, "/")
+                    # ZipFile.write 沿用压缩包的压缩方式和级别，并流式写入
+                    zf.write(entry.path, arcname)
 
             print(f"✓ Gerber文件已打包: {zip_file}")
-            self.results["exports"]["gerber_zip"] = zip_file.exists()
+            self._record_export("gerber_zip", zip_file.exists())
+            self._save_cache(
+                "gerber_zip", fingerprint, [zip_file], {"exports": {"gerber_zip": True}}
+            )
 
         return success1 and success2
 
-    def export_pcb_images(self) -> bool:
-        """导出PCB图像和3D模型"""
-        if not self.pcb_file.exists():
+    def export_pcb_images(self, jobs: Optional[int] = None) -> bool:
+        """导出PCB图像和3D模型（三个 kicad-cli 进程按 jobs 并行运行）"""
+        if not self._pcb_exists:
             print(f"⚠ 跳过PCB图像导出: PCB文件不存在")
             return False
 
-        all_success = True
+        results = self._run_tasks(
+            [self._export_front_svg, self._export_back_svg, self._export_step], jobs
+        )
+        return all(results)
 
-        # 导出正面SVG
+    def _export_front_svg(self) -> bool:
+        """导出PCB正面SVG"""
         front_svg = self.output_dir / f"{self.project_name}-PCB-Front.svg"
         args_front = [
             self.kicad_cli,
@@ -570,15 +1170,16 @@ class KiCadExporter:
             "--output",
             str(front_svg),
             "--layers",
-            "F.Cu,F.Mask,F.Silkscreen,Edge.Cuts",
-            str(self.pcb_file),
+            PCB_FRONT_LAYERS,
+            self._pcb_arg,
         ]
 
-        success, _ = self._run_command(args_front, "导出PCB正面图像")
-        self.results["exports"]["pcb_front_svg"] = front_svg.exists()
-        all_success = all_success and success
+        return self._run_cached_export(
+            "pcb_front_svg", args_front, front_svg, self._pcb_inputs, "导出PCB正面图像"
+        )
 
-        # 导出背面SVG
+    def _export_back_svg(self) -> bool:
+        """导出PCB背面SVG"""
         back_svg = self.output_dir / f"{self.project_name}-PCB-Back.svg"
         args_back = [
             self.kicad_cli,
@@ -588,15 +1189,16 @@ class KiCadExporter:
             "--output",
             str(back_svg),
             "--layers",
-            "B.Cu,B.Mask,B.Silkscreen,Edge.Cuts",
-            str(self.pcb_file),
+            PCB_BACK_LAYERS,
+            self._pcb_arg,
         ]
 
-        success, _ = self._run_command(args_back, "导出PCB背面图像")
-        self.results["exports"]["pcb_back_svg"] = back_svg.exists()
-        all_success = all_success and success
+        return self._run_cached_export(
+            "pcb_back_svg", args_back, back_svg, self._pcb_inputs, "导出PCB背面图像"
+        )
 
-        # 导出3D STEP模型
+    def _export_step(self) -> bool:
+        """导出3D STEP模型"""
         step_file = self.output_dir / f"{self.project_name}-3D.step"
 
         args_step = [
@@ -604,19 +1206,26 @@ class KiCadExporter:
             "pcb",
             "export",
             "step",
-            "--no-dnp",
-            "--drill-origin",
-            "--subst-models",
-            "--min-distance",
-            "0.01mm",
+            *STEP_EXPORT_ARGS,
             "--output",
             str(step_file),
-            str(self.pcb_file),
+            self._pcb_arg,
         ]
 
-        success, _ = self._run_command(args_step, "导出3D STEP模型")
+        # 3D 模型库位置会影响 STEP 内容，一并计入指纹
+        return self._run_cached_export(
+            "step_3d",
+            args_step,
+            step_file,
+            self._pcb_inputs,
+            "导出3D STEP模型",
+            extra_fingerprint=([os.getenv("KICAD9_3DMODEL_DIR", "")],),
+            check_output=self._check_step_file,
+        )
 
-        # 验证STEP结果
+    @staticmethod
+    def _check_step_file(step_file: Path) -> bool:
+        """验证STEP结果：文件存在且非空"""
         if step_file.exists() and step_file.stat().st_size > 0:
             file_size_kb = step_file.stat().st_size / 1024
             print(f"✓ STEP文件: {file_size_kb:.1f} KB")
@@ -627,23 +1236,20 @@ class KiCadExporter:
                 print(
                     f"  提示：需要设置 KICAD9_3DMODEL_DIR 环境变量并使用 --subst-models 参数"
                 )
+            return True
 
-            self.results["exports"]["step_3d"] = True
-        else:
-            print(f"✗ STEP文件未生成或为空")
-            self.results["exports"]["step_3d"] = False
-
-        all_success = all_success and success
-        return all_success
+        print(f"✗ STEP文件未生成或为空")
+        return False
 
-    def _get_system_info(self) -> dict:
+    @functools.cached_property
+    def _system_info(self) -> dict:
         """获取系统和构建环境信息
 
+        运行期间不会变化，只收集一次。
+
         返回：
             包含操作系统、Python版本、KiCad版本和CI/CD环境信息的字典
         """
-        import platform
-
         info = {
             "os": platform.system(),
             "os_version": platform.release(),
@@ -651,14 +1257,8 @@ class KiCadExporter:
             "kicad_cli": self.kicad_cli,
         }
 
-        try:
-            result = subprocess.run(
-                [self.kicad_cli, "version"], capture_output=True, text=True, timeout=5
-            )
-            if result.returncode == 0:
-                info["kicad_version"] = result.stdout.strip()
-        except:
-            info["kicad_version"] = "未知"
+        # 复用检测 CLI 时得到的版本号，避免再启动一次 kicad-cli
+        info["kicad_version"] = self._get_kicad_version() or "未知"
 
         # 从 GitLab CI/CD 环境变量中提取关键信息
         # CI_COMMIT_SHA 截取前8位以便显示
@@ -691,24 +1291,9 @@ class KiCadExporter:
         返回：
             Markdown 格式的报告字符串
         """
-        from datetime import datetime, timezone, timedelta
-
-        system_info = self._get_system_info()
-
-        required_exports = [
-            "schematic_pdf",
-            "bom",
-            "gerber_zip",
-            "pcb_front_svg",
-            "pcb_back_svg",
-            "step_3d",
-        ]
+        system_info = self._system_info
 
-        failed_exports = [
-            key
-            for key in required_exports
-            if not self.results["exports"].get(key, False)
-        ]
+        failed_exports = _failed_exports(self.results["exports"])
 
         # 判断构建状态：检测模式下根据ERC/DRC错误判断，导出模式下根据文件导出判断
         erc_has_errors = self.results["erc"].get("errors", 0) > 0
@@ -738,61 +1323,38 @@ class KiCadExporter:
         beijing_tz = timezone(timedelta(hours=8))
         beijing_time = datetime.now(beijing_tz)
 
-        summary = f"""# {status_emoji} {self.project_name} - 构建报告
-
-## 📋 构建信息
-
-| 项目 | 信息 |
-|------|------|
-| **状态** | {build_status} |
-| **时间** | {beijing_time.strftime('%Y-%m-%d %H:%M:%S')} (北京时间) |
-| **项目** | {self.project_name} |"""
+        parts: List[str] = [
+            f"# {status_emoji} {self.project_name} - 构建报告",
+            "",
+            "## 📋 构建信息",
+            "",
+            "| 项目 | 信息 |",
+            "|------|------|",
+            f"| **状态** | {build_status} |",
+            f"| **时间** | {beijing_time.strftime('%Y-%m-%d %H:%M:%S')} (北京时间) |",
+            f"| **项目** | {self.project_name} |",
+        ]
 
         # 添加提交信息
         if system_info.get("CI_COMMIT_SHA"):
-            summary += f"\n| **提交** | `{system_info['CI_COMMIT_SHA']}` ({system_info.get('CI_COMMIT_REF_NAME', '')}) |"
-
-        summary += "\n\n## 🔍 质量检查结果\n\n"
-
-        # ERC 检查
-        erc_result = self.results["erc"]
-        if erc_result["status"] == "passed":
-            if erc_result.get("warnings", 0) > 0:
-                summary += f"### ✅ ERC (电气规则检查) - 通过\n\n- 警告: {erc_result.get('warnings', 0)} 个（不影响通过）\n"
-                if erc_result.get("exclusions", 0) > 0:
-                    summary += f"- 已排除: {erc_result['exclusions']} 个\n"
-                summary += "\n"
-            else:
-                summary += f"### ✅ ERC (电气规则检查) - 通过\n\n无错误和警告\n\n"
-        elif erc_result["status"] == "failed":
-            summary += f"### ❌ ERC (电气规则检查) - 失败\n\n- 错误: {erc_result.get('errors', 0)} 个\n- 警告: {erc_result.get('warnings', 0)} 个\n"
-            if erc_result.get("exclusions", 0) > 0:
-                summary += f"- 已排除: {erc_result['exclusions']} 个\n"
-            summary += "\n"
-        else:
-            summary += f"### ℹ️ ERC (电气规则检查) - {erc_result['status']}\n\n"
-
-        # DRC 检查
-        drc_result = self.results["drc"]
-        if drc_result["status"] == "passed":
-            if drc_result.get("warnings", 0) > 0:
-                summary += f"### ✅ DRC (设计规则检查) - 通过\n\n- 警告: {drc_result.get('warnings', 0)} 个（不影响通过）\n"
-                if drc_result.get("exclusions", 0) > 0:
-                    summary += f"- 已排除: {drc_result['exclusions']} 个\n"
-                summary += "\n"
-            else:
-                summary += f"### ✅ DRC (设计规则检查) - 通过\n\n无错误和警告\n\n"
-        elif drc_result["status"] == "failed":
-            summary += f"### ❌ DRC (设计规则检查) - 失败\n\n- 错误: {drc_result.get('errors', 0)} 个\n- 警告: {drc_result.get('warnings', 0)} 个\n"
-            if drc_result.get("exclusions", 0) > 0:
-                summary += f"- 已排除: {drc_result['exclusions']} 个\n"
-            summary += "\n"
-        else:
-            summary += f"### ℹ️ DRC (设计规则检查) - {drc_result['status']}\n\n"
+            parts.append(
+                f"| **提交** | `{system_info['CI_COMMIT_SHA']}` "
+                f"({system_info.get('CI_COMMIT_REF_NAME', '')}) |"
+            )
+
+        parts.extend(["", "## 🔍 质量检查结果", ""])
+
+        # ERC / DRC 检查
+        parts.extend(
+            self._render_check_block("ERC (电气规则检查)", self.results["erc"])
+        )
+        parts.extend(
+            self._render_check_block("DRC (设计规则检查)", self.results["drc"])
+        )
 
         # 只在非跳过导出模式下显示文件导出部分
         if not skip_exports:
-            summary += "## 📦 生成文件\n\n"
+            parts.extend(["## 📦 生成文件", ""])
 
             exports = [
                 ("schematic_pdf", "📄 原理图PDF", True),
@@ -806,29 +1368,65 @@ class KiCadExporter:
             for key, name, required in exports:
                 exported = self.results["exports"].get(key, False)
                 if exported:  # 如果导出成功
-                    summary += f"- ✅ {name}\n"
+                    parts.append(f"- ✅ {name}")
                 elif required:  # 如果导出失败 且 required=True
-                    summary += f"- ❌ {name}\n"
+                    parts.append(f"- ❌ {name}")
                 else:  # 如果导出失败 且 required=False
-                    summary += f"- ⏭️ {name} (可选)\n"
+                    parts.append(f"- ⏭️ {name} (可选)")
 
-            summary += "\n"
+            parts.append("")
 
         # 测试环境信息(折叠区域)
-        summary += f"\n<details>\n<summary>🔧 测试环境详情</summary>\n\n"
-        summary += f"- **操作系统**: {system_info.get('os', 'unknown')} {system_info.get('os_version', '')}\n"
-        summary += f"- **Python版本**: {system_info.get('python_version', 'unknown')}\n"
-        summary += f"- **KiCad CLI**: `{system_info.get('kicad_cli', 'unknown')}`\n"
-        summary += f"- **KiCad版本**: {system_info.get('kicad_version', 'unknown')}\n"
+        os_name = system_info.get("os", "unknown")
+        parts.extend(
+            [
+                "",
+                "<details>",
+                "<summary>🔧 测试环境详情</summary>",
+                "",
+                f"- **操作系统**: {os_name} {system_info.get('os_version', '')}",
+                f"- **Python版本**: {system_info.get('python_version', 'unknown')}",
+                f"- **KiCad CLI**: `{system_info.get('kicad_cli', 'unknown')}`",
+                f"- **KiCad版本**: {system_info.get('kicad_version', 'unknown')}",
+            ]
+        )
 
         if system_info.get("CI_RUNNER_DESCRIPTION"):
-            summary += f"- **CI Runner**: {system_info['CI_RUNNER_DESCRIPTION']}\n"
+            parts.append(f"- **CI Runner**: {system_info['CI_RUNNER_DESCRIPTION']}")
         if system_info.get("CI_RUNNER_TAGS"):
-            summary += f"- **Runner标签**: {system_info['CI_RUNNER_TAGS']}\n"
-
-        summary += "\n</details>\n"
+            parts.append(f"- **Runner标签**: {system_info['CI_RUNNER_TAGS']}")
+
+        parts.extend(["", "</details>", ""])
+
+        return "\n".join(parts)
+
+    @staticmethod
+    def _render_check_block(name: str, result: dict) -> List[str]:
+        """生成单项检查（ERC/DRC）在摘要中的 Markdown 行"""
+        status = result["status"]
+        if status == "passed":
+            if result.get("warnings", 0) > 0:
+                lines = [
+                    f"### ✅ {name} - 通过",
+                    "",
+                    f"- 警告: {result.get('warnings', 0)} 个（不影响通过）",
+                ]
+            else:
+                return [f"### ✅ {name} - 通过", "", "无错误和警告", ""]
+        elif status == "failed":
+            lines = [
+                f"### ❌ {name} - 失败",
+                "",
+                f"- 错误: {result.get('errors', 0)} 个",
+                f"- 警告: {result.get('warnings', 0)} 个",
+            ]
+        else:
+            return [f"### ℹ️ {name} - {status}", ""]
 
-        return summary
+        if result.get("exclusions", 0) > 0:
+            lines.append(f"- 已排除: {result['exclusions']} 个")
+        lines.append("")
+        return lines
 
     def save_summary(self, skip_exports: bool = False):
         """保存构建摘要
@@ -839,14 +1437,21 @@ class KiCadExporter:
         summary = self.generate_summary(skip_exports=skip_exports)
         summary_file = self.output_dir / "build_summary.md"
 
-        with open(summary_file, "w", encoding="utf-8") as f:
-            f.write(summary)
+        summary_file.write_text(summary, encoding="utf-8")
+
+        # 保存提示与摘要正文直接输出内存中的字符串，一次写出
+        print(f"\n✓ 构建摘要已保存: {summary_file}\n\n{summary}")
 
-        print(f"\n✓ 构建摘要已保存: {summary_file}")
-        print("\n" + summary)
+    def run_all(self, skip_checks=False, skip_exports=False, jobs=None, summary=True):
+        """运行所有任务
 
-    def run_all(self, skip_checks=False, skip_exports=False):
-        """运行所有任务"""
+        各项检查与导出调用相互独立的 kicad-cli 进程，按 jobs 并行执行；
+        每个任务的输出先写入缓冲区，再按提交顺序输出。
+
+        参数：
+            jobs: 并行任务数，默认使用 CPU 核数，1 表示顺序执行
+            summary: 是否生成构建摘要 (build_summary.md)
+        """
         print("=" * 60)
         print("KiCad 自动化导出工具")
         print("=" * 60)
@@ -854,25 +1459,141 @@ class KiCadExporter:
         print(f"输出目录: {self.output_dir}")
         print("=" * 60)
 
+        tasks: List[Callable[[], bool]] = []
+
         # 质量检查
         if not skip_checks:
-            self.run_erc()
-            self.run_drc()
+            tasks.extend([self.run_erc, self.run_drc])
 
-        # 导出文件
+        # 导出文件（PCB 图像拆分为三个独立任务）
         if not skip_exports:
-            self.export_schematic_pdf()
-            self.export_bom()
-            self.export_gerber()
-            self.export_pcb_images()
+            tasks.extend(
+                [
+                    self.export_schematic_pdf,
+                    self.export_bom,
+                    functools.partial(self.export_gerber, jobs=jobs),
+                ]
+            )
+            if self._pcb_exists:
+                tasks.extend(
+                    [self._export_front_svg, self._export_back_svg, self._export_step]
+                )
+            else:
+                tasks.append(self.export_pcb_images)
+
+        self._run_tasks(tasks, jobs)
 
         # 生成摘要（传递 skip_exports 参数）
-        self.save_summary(skip_exports=skip_exports)
+        if summary:
+            self.save_summary(skip_exports=skip_exports)
 
         print("\n" + "=" * 60)
         print("✓ 所有任务完成")
         print("=" * 60)
 
+    def _run_tasks(
+        self, tasks: List[Callable[[], bool]], jobs: Optional[int] = None
+    ) -> List[bool]:
+        """并行运行任务，按提交顺序输出各任务的打印内容并返回各任务结果"""
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+
+        if jobs <= 1 or len(tasks) <= 1:
+            return [task() for task in tasks]
+
+        # 任务线程的打印写入各自的缓冲区；嵌套调用时外层任务的缓冲区
+        # 会收到内层任务的输出，不需要临时替换 sys.stdout
+        stdout = ThreadRoutedStream.install("stdout")
+
+        def run_buffered(task):
+            with stdout.redirect(io.StringIO()) as buffer:
+                try:
+                    success = task()
+                    return buffer.getvalue(), success, None
+                except Exception as e:
+                    return buffer.getvalue(), False, e
+
+        with ThreadPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            futures = [executor.submit(run_buffered, task) for task in tasks]
+            results = []
+            first_error = None
+            # 先按顺序输出所有任务的打印内容，再抛出第一个异常
+            for future in futures:
+                output, success, error = future.result()
+                stdout.write(output)
+                if error is not None and first_error is None:
+                    first_error = error
+                results.append(success)
+        if first_error is not None:
+            raise first_error
+        return results
+
+
+# 各运行模式的退出码判定策略
+#   check_title: ERC/DRC 有错误（不包括警告）时的失败标题，None 表示不判定
+#   export_title: 必需文件未导出时的失败标题，None 表示不判定
+#   ok_warnings / ok_clean: 成功时（有警告 / 无警告）的提示
+EXIT_POLICIES = {
+    # 检查模式：ERC 或 DRC 有错误视为失败
+    "check": {
+        "check_title": "检测失败",
+        "export_title": None,
+        "ok_warnings": "检测通过: 无错误（{warnings} 个警告不影响通过）",
+        "ok_clean": "检测通过: ERC 和 DRC 均无问题",
+    },
+    # 导出模式：只要文件成功导出就算成功
+    "export": {
+        "check_title": None,
+        "export_title": "导出失败",
+        "ok_warnings": "导出成功: 所有必需文件已生成",
+        "ok_clean": "导出成功: 所有必需文件已生成",
+    },
+    # 完整模式：检查 + 导出，只有错误才算失败
+    "full": {
+        "check_title": "质量检测失败",
+        "export_title": "文件导出失败",
+        "ok_warnings": "构建成功: 无错误且文件已导出（{warnings} 个警告不影响通过）",
+        "ok_clean": "构建成功: 检查通过且文件已导出",
+    },
+}
+
+
+def _report_exit(results: dict, mode: str) -> int:
+    """按运行模式输出最终结论并返回退出码（失败信息一次写入 stderr）"""
+    policy = EXIT_POLICIES[mode]
+    # 每项检查的 (错误数, 警告数) 只取一次，下面的判断和输出共用
+    counts = [
+        (name, result.get("errors", 0), result.get("warnings", 0))
+        for name, result in (("ERC", results["erc"]), ("DRC", results["drc"]))
+    ]
+
+    if policy["check_title"]:
+        failed_checks = [item for item in counts if item[1] > 0]
+        if failed_checks:
+            parts = [f"\n❌ {policy['check_title']}:\n"]
+            for name, errors, warnings in failed_checks:
+                parts.append(f"  {name}: {errors} 个错误, {warnings} 个警告\n")
+            sys.stderr.write("".join(parts))
+            sys.stderr.flush()
+            return 1
+
+    if policy["export_title"]:
+        failed_exports = _failed_exports(results["exports"])
+        if failed_exports:
+            sys.stderr.write(
+                f"\n❌ {policy['export_title']}: 以下文件未成功生成\n"
+                + "".join(f"  - {key}\n" for key in failed_exports)
+            )
+            sys.stderr.flush()
+            return 1
+
+    total_warnings = sum(warnings for _, _, warnings in counts)
+    if total_warnings > 0:
+        print("\n✅ " + policy["ok_warnings"].format(warnings=total_warnings))
+    else:
+        print("\n✅ " + policy["ok_clean"])
+    return 0
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -928,6 +1649,34 @@ def main():
         action="store_true",
         help="导出模式：运行检查但只根据文件导出判断成败 (推荐用于 CI/CD)",
     )
+    parser.add_argument(
+        "--no-cache",
+        "--force",
+        dest="no_cache",
+        action="store_true",
+        help="不使用结果缓存，强制重新运行所有检查和导出 (也可设置 KICAD_EXPORT_NO_CACHE=1)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="并行运行的 kicad-cli 任务数 (默认: CPU 核数，1 表示顺序执行)",
+    )
+    parser.add_argument(
+        "--gerber-compress",
+        choices=sorted(GERBER_ZIP_METHODS),
+        default="deflate",
+        help="Gerber 压缩包的压缩方式 (默认: deflate)",
+    )
+    parser.add_argument(
+        "--no-cli-cache",
+        action="store_true",
+        help="忽略已缓存的 KiCad CLI 检测结果，重新查找 kicad-cli",
+    )
+    parser.add_argument(
+        "--no-summary", action="store_true", help="不生成构建摘要 (build_summary.md)"
+    )
 
     args = parser.parse_args()
 
@@ -937,127 +1686,49 @@ def main():
             args.output,
             args.kicad_cli_path,
             args.gerber_layers,
+            use_cache=not args.no_cache,
+            gerber_compress=args.gerber_compress,
+            use_cli_cache=not args.no_cli_cache,
+        )
+        exporter.run_all(
+            skip_checks=args.skip_checks,
+            skip_exports=args.skip_exports,
+            jobs=args.jobs,
+            summary=not args.no_summary,
         )
-        exporter.run_all(skip_checks=args.skip_checks, skip_exports=args.skip_exports)
-
-        # 判断运行模式
-        check_only_mode = args.skip_exports
-        export_only_mode = args.skip_checks or args.export_mode
-
-        if check_only_mode:
-            # 检查模式：ERC 或 DRC 有错误（不包括警告）视为失败
-            erc_failed = exporter.results["erc"]["status"] == "failed"
-            drc_failed = exporter.results["drc"]["status"] == "failed"
-
-            if erc_failed or drc_failed:
-                erc_status = exporter.results["erc"]
-                drc_status = exporter.results["drc"]
-                print(f"\n❌ 检测失败:", file=sys.stderr)
-                if erc_failed:
-                    print(
-                        f"  ERC: {erc_status.get('errors', 0)} 个错误, {erc_status.get('warnings', 0)} 个警告",
-                        file=sys.stderr,
-                    )
-                if drc_failed:
-                    print(
-                        f"  DRC: {drc_status.get('errors', 0)} 个错误, {drc_status.get('warnings', 0)} 个警告",
-                        file=sys.stderr,
-                    )
-                sys.exit(1)
-            else:
-                erc_status = exporter.results["erc"]
-                drc_status = exporter.results["drc"]
-                total_warnings = erc_status.get("warnings", 0) + drc_status.get(
-                    "warnings", 0
-                )
-                if total_warnings > 0:
-                    print(f"\n✅ 检测通过: 无错误（{total_warnings} 个警告不影响通过）")
-                else:
-                    print(f"\n✅ 检测通过: ERC 和 DRC 均无问题")
-                sys.exit(0)
-
-        elif export_only_mode:
-            # 导出模式：只要文件成功导出就算成功
-            required_exports = [
-                "schematic_pdf",
-                "bom",
-                "gerber_zip",
-                "pcb_front_svg",
-                "pcb_back_svg",
-                "step_3d",
-            ]
-            failed_exports = [
-                key
-                for key in required_exports
-                if not exporter.results["exports"].get(key, False)
-            ]
-
-            if failed_exports:
-                print(f"\n❌ 导出失败: 以下文件未成功生成", file=sys.stderr)
-                for key in failed_exports:
-                    print(f"  - {key}", file=sys.stderr)
-                sys.exit(1)
-            else:
-                print(f"\n✅ 导出成功: 所有必需文件已生成")
-                sys.exit(0)
 
+        # 判断运行模式：检查模式 / 导出模式 / 完整模式
+        if args.skip_exports:
+            mode = "check"
+        elif args.skip_checks or args.export_mode:
+            mode = "export"
         else:
-            # 完整模式：检查 + 导出，只有错误才算失败
-            erc_has_errors = exporter.results["erc"].get("errors", 0) > 0
-            drc_has_errors = exporter.results["drc"].get("errors", 0) > 0
-
-            required_exports = [
-                "schematic_pdf",
-                "bom",
-                "gerber_zip",
-                "pcb_front_svg",
-                "pcb_back_svg",
-                "step_3d",
-            ]
-            failed_exports = [
-                key
-                for key in required_exports
-                if not exporter.results["exports"].get(key, False)
-            ]
-
-            if erc_has_errors or drc_has_errors:
-                erc_status = exporter.results["erc"]
-                drc_status = exporter.results["drc"]
-                print(f"\n❌ 质量检测失败:", file=sys.stderr)
-                if erc_has_errors:
-                    print(
-                        f"  ERC: {erc_status.get('errors', 0)} 个错误, {erc_status.get('warnings', 0)} 个警告",
-                        file=sys.stderr,
-                    )
-                if drc_has_errors:
-                    print(
-                        f"  DRC: {drc_status.get('errors', 0)} 个错误, {drc_status.get('warnings', 0)} 个警告",
-                        file=sys.stderr,
-                    )
-                sys.exit(1)
-            elif failed_exports:
-                print(f"\n❌ 文件导出失败: 以下文件未成功生成", file=sys.stderr)
-                for key in failed_exports:
-                    print(f"  - {key}", file=sys.stderr)
-                sys.exit(1)
-            else:
-                erc_status = exporter.results["erc"]
-                drc_status = exporter.results["drc"]
-                total_warnings = erc_status.get("warnings", 0) + drc_status.get(
-                    "warnings", 0
-                )
-                if total_warnings > 0:
-                    print(
-                        f"\n✅ 构建成功: 无错误且文件已导出（{total_warnings} 个警告不影响通过）"
-                    )
-                else:
-                    print(f"\n✅ 构建成功: 检查通过且文件已导出")
-                sys.exit(0)
+            mode = "full"
+        sys.exit(_report_exit(exporter.results, mode))
 
     except Exception as e:
         print(f"\n✗ 错误: {e}", file=sys.stderr)
         sys.exit(2)
 
 
+def _fast_exit(code) -> None:
+    """刷新标准输出后直接结束进程，跳过解释器的清理过程（模块、对象回收）
+
+    本模块没有注册 atexit 清理；main() 内的 finally 在 SystemExit 传出前已执行。
+    """
+    if code is None:
+        code = 0
+    elif not isinstance(code, int):
+        print(code, file=sys.stderr)
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code)
+
+
 if __name__ == "__main__":
-    main()
+    # 仅在命令行入口快速退出；GUI 在进程内调用 main() 并捕获 SystemExit
+    try:
+        main()
+    except SystemExit as e:
+        _fast_exit(e.code)